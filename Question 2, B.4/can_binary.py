@@ -0,0 +1,203 @@
+import argparse
+import binascii
+import mmap
+import os
+import re
+from collections import Counter
+import numpy as np
+from can_frames_error_detection_ED25B041 import CRC_MASK
+from can_log_validator import (
+    ERRORS, NO_CRC, OK, RESULT_DTYPE, check_frames, count_errors, crc_frames,
+    new_results,
+)
+
+
+# packed capture record, 16 bytes, little endian
+RECORD_DTYPE = np.dtype([
+    ("id", "<u4"),
+    ("dlc", "u1"),
+    ("flags", "u1"),
+    ("crc", "<u2"),
+    ("data", "u1", (8,)),
+])
+FLAG_CRC = 0x01     # the crc field holds a CRC to check
+
+# candump writes standard ids as 3 hex digits and extended ones as 8;
+# extended ids carry SocketCAN's flag so even 00000123 fails the id check
+CAN_EFF_FLAG = 0x80000000
+
+# classic candump -l / -L line: "(1436509052.249713) can0 123#DEADBEEF"
+# RTR, CAN FD ("##") and error frames don't match and are skipped
+CANDUMP_LINE = re.compile(
+    rb"^[ \t]*\(\d+\.\d+\)[ \t]+\S+[ \t]+([0-9A-Fa-f]{1,8})#((?:[0-9A-Fa-f]{2})*)[ \t]*\r?$",
+    re.MULTILINE,
+)
+
+
+def _empty():
+    return np.zeros(0, dtype=RESULT_DTYPE)
+
+
+########################## PACKED RECORDS ##########################
+
+def write_records(filename, ids, dlcs, data, crcs=None):
+    """
+    Write frames as RECORD_DTYPE records.
+
+    data : (N, 8) uint8; crcs : (N,) CRCs, or None to mark all frames
+    as having no CRC.
+    """
+    records = np.zeros(len(ids), dtype=RECORD_DTYPE)
+    records["id"] = ids
+    records["dlc"] = dlcs
+    records["data"] = data
+    if crcs is not None:
+        records["crc"] = crcs
+        records["flags"] = FLAG_CRC
+    records.tofile(filename)
+
+
+def check_records(records, first_row=0):
+    """Validate RECORD_DTYPE records; rows are record indices."""
+    ids = records["id"].astype(np.int64)
+    dlcs = records["dlc"].astype(np.int64)
+    crcs = np.where(records["flags"] & FLAG_CRC,
+                    records["crc"].astype(np.int64) & CRC_MASK, NO_CRC)
+
+    res = new_results(len(records))
+    res["row"] = np.arange(first_row, first_row + len(records))
+    res["id"] = ids
+    res["dlc"] = dlcs
+    # a packed record always carries dlc data bytes
+    res["error"], res["crc"] = check_frames(ids, dlcs, dlcs, records["data"], crcs)
+    return res
+
+
+def iter_record_results(filename, chunk_records=1 << 20, counts=None):
+    """Validate a packed capture through a memory map, chunk by chunk."""
+    size = os.path.getsize(filename)
+    if size % RECORD_DTYPE.itemsize:
+        raise ValueError(f"{filename}: size is not a multiple of "
+                         f"{RECORD_DTYPE.itemsize}-byte records")
+    if size == 0:
+        return
+
+    records = np.memmap(filename, dtype=RECORD_DTYPE, mode="r")
+    for start in range(0, len(records), chunk_records):
+        res = check_records(records[start:start + chunk_records], start)
+        if counts is not None:
+            count_errors(res, counts)
+        yield res
+
+
+########################## CANDUMP LOGS ##########################
+
+def parse_candump(buf, first_row=0):
+    """
+    Classic frames in a block of candump log lines -> (results with
+    id/dlc filled in, data (N, 8) uint8, number of lines skipped).
+
+    Rows are frame indices; the dlc is the number of data bytes. An id
+    field longer than 3 digits is extended and gets CAN_EFF_FLAG set.
+    """
+    matches = CANDUMP_LINE.findall(buf)
+    n = len(matches)
+    lines = buf.count(b"\n") + (not buf.endswith(b"\n"))
+    if not n:
+        return _empty(), np.zeros((0, 8), dtype=np.uint8), lines
+
+    ids = np.array([int(m[0], 16) for m in matches], dtype=np.int64)
+    extended = np.array([len(m[0]) > 3 for m in matches], dtype=bool)
+    ids[extended] |= CAN_EFF_FLAG
+    payloads = [m[1] for m in matches]
+    counts = np.array([len(p) // 2 for p in payloads], dtype=np.int64)
+    raw = np.frombuffer(binascii.unhexlify(b"".join(payloads)), dtype=np.uint8)
+
+    # scatter the bytes into an (N, 8) table, dropping any past 8
+    # (those frames fail the dlc check anyway)
+    rows_of = np.repeat(np.arange(n), counts)
+    cols_of = np.arange(len(raw)) - np.repeat(np.cumsum(counts) - counts, counts)
+    keep = cols_of < 8
+    data = np.zeros((n, 8), dtype=np.uint8)
+    data[rows_of[keep], cols_of[keep]] = raw[keep]
+
+    res = new_results(n)
+    res["row"] = np.arange(first_row, first_row + n)
+    res["id"] = ids
+    res["dlc"] = counts
+    return res, data, lines - n
+
+
+def iter_candump_results(filename, chunk_bytes=1 << 24, counts=None):
+    """
+    Validate a candump log through a memory map, in line-aligned
+    blocks of about chunk_bytes.
+
+    candump logs carry no CRC, so only the id and dlc checks apply; the
+    CRC is still computed. Extended (29-bit) ids fail the 11-bit id
+    check, whatever their value, like they do in validate_row.
+    Skipped lines are counted under "skipped".
+    """
+    if os.path.getsize(filename) == 0:
+        return
+
+    row = 0
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = 0
+        while pos < len(mm):
+            stop = min(pos + chunk_bytes, len(mm))
+            if stop < len(mm):
+                newline = mm.find(b"\n", stop - 1)
+                stop = len(mm) if newline < 0 else newline + 1
+
+            res, data, skipped = parse_candump(mm[pos:stop], row)
+            pos = stop
+            if counts is not None and skipped:
+                counts["skipped"] += skipped
+            if not len(res):
+                continue
+
+            ids = res["id"]
+            dlcs = res["dlc"]
+            res["error"], res["crc"] = check_frames(
+                ids, dlcs, dlcs, data, np.full(len(res), NO_CRC))
+            # with no CRC given check_frames leaves it uncomputed
+            valid = res["error"] == OK
+            res["crc"][valid] = crc_frames(ids[valid], dlcs[valid], data[valid])
+
+            if counts is not None:
+                count_errors(res, counts)
+            row += len(res)
+            yield res
+
+
+def validate_capture(filename, fmt=None):
+    """
+    Validate a packed (.bin) or candump (.log) capture.
+    Returns (all results, counts by error class).
+    """
+    fmt = fmt or ("candump" if filename.endswith((".log", ".txt")) else "records")
+    counts = Counter()
+    if fmt == "candump":
+        chunks = list(iter_candump_results(filename, counts=counts))
+    else:
+        chunks = list(iter_record_results(filename, counts=counts))
+    results = np.concatenate(chunks) if chunks else _empty()
+    return results, counts
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Validate a binary or candump CAN capture")
+    parser.add_argument("capture")
+    parser.add_argument("--format", choices=("records", "candump"),
+                        help="default: candump for .log/.txt, packed records otherwise")
+    args = parser.parse_args()
+
+    results, counts = validate_capture(args.capture, args.format)
+
+    print(f"{len(results)} frames")
+    for name in ERRORS:
+        print(f"{name:22s}: {counts[name]}")
+    if counts["skipped"]:
+        print(f"{'skipped lines':22s}: {counts['skipped']}")
@@ -0,0 +1,270 @@
+import argparse
+from collections import Counter
+import numpy as np
+
+
+# Decoder for raw CAN bus captures: one sample per bit time,
+# 0 = dominant, 1 = recessive. Frames are found by their SOF after an
+# idle bus, destuffed, split into fields and checked.
+#
+# The CRC here is the on-wire CAN CRC-15 (poly 0x4599, MSB first, the
+# input bit xored into the register's top bit). It is not the same as
+# calculate_crc in can_frames_error_detection_ED25B041.py, which
+# shifts differently and only exists for that exercise's CSV.
+
+CAN_POLY = 0x4599
+CAN_CRC_MASK = 0x7FFF
+
+IDLE_BITS = 10      # recessive bits before a SOF (EOF + intermission)
+STUFF_RUN = 5
+
+ERRORS = ("none", "stuff error", "crc error", "form error", "ack error", "truncated")
+OK, STUFF_ERROR, CRC_ERROR, FORM_ERROR, ACK_ERROR, TRUNCATED = range(len(ERRORS))
+
+FRAME_DTYPE = np.dtype([
+    ("start", "i8"),        # bit index of the SOF in the stream
+    ("id", "i8"),
+    ("extended", "?"),
+    ("rtr", "?"),
+    ("dlc", "u1"),
+    ("data", "u1", (8,)),
+    ("crc", "i4"),          # CRC field as received, -1 if not reached
+    ("error", "u1"),        # index into ERRORS
+    ("error_bit", "i8"),    # bit index where the error was detected, -1 if none
+])
+
+
+def _bitwise_crc(crc, value, n):
+    for i in range(n - 1, -1, -1):
+        crc_nxt = ((value >> i) ^ (crc >> 14)) & 1
+        crc = (crc << 1) & CAN_CRC_MASK
+        if crc_nxt:
+            crc ^= CAN_POLY
+    return crc
+
+CAN_CRC_TABLE = [_bitwise_crc(0, i, 8) for i in range(256)]
+
+
+def can_crc15(value, n_bits):
+    """On-wire CAN CRC-15 of the n_bits-bit number `value` (MSB first)."""
+    lead = n_bits % 8
+    crc = _bitwise_crc(0, value >> (n_bits - lead), lead)
+    table = CAN_CRC_TABLE
+    for byte in (value & ((1 << (n_bits - lead)) - 1)).to_bytes((n_bits - lead) // 8, "big"):
+        crc = ((crc << 8) & CAN_CRC_MASK) ^ table[((crc >> 7) ^ byte) & 0xFF]
+    return crc
+
+
+########################## ENCODING ##########################
+
+def stuff(bits):
+    """Insert a complement bit after every 5 equal bits ('0'/'1' string)."""
+    out = []
+    run_bit = None
+    run = 0
+    for b in bits:
+        out.append(b)
+        run = run + 1 if b == run_bit else 1
+        run_bit = b
+        if run == STUFF_RUN:
+            run_bit = "1" if b == "0" else "0"
+            out.append(run_bit)
+            run = 1
+    return "".join(out)
+
+
+def encode_frame(id_val, data=b"", extended=False, rtr=False, dlc=None, ack=True):
+    """
+    Classic CAN data/remote frame as transmitted on the bus, from SOF
+    to the end of EOF, as a '0'/'1' string.
+    """
+    dlc = len(data) if dlc is None else dlc
+    r = "1" if rtr else "0"
+    if extended:
+        head = (f"0{id_val >> 18:011b}1" "1" f"{id_val & 0x3FFFF:018b}"
+                f"{r}00{dlc:04b}")
+    else:
+        head = f"0{id_val:011b}{r}00{dlc:04b}"
+    body = head + ("" if rtr else "".join(f"{b:08b}" for b in data))
+    crc = can_crc15(int(body, 2), len(body))
+    tail = "1" + ("0" if ack else "1") + "1" + "1" * 7
+    return stuff(body + f"{crc:015b}") + tail
+
+
+########################## DECODING ##########################
+
+def _next_run(s, start):
+    """Index of the next run of STUFF_RUN equal bits, len(s) if none."""
+    a = s.find("0" * STUFF_RUN, start)
+    b = s.find("1" * STUFF_RUN, start)
+    if a < 0:
+        return len(s) if b < 0 else b
+    return a if b < 0 or a < b else b
+
+
+def _stuffed_length(d):
+    """
+    Destuffed bits from SOF to the end of the CRC, once the header in
+    d is complete; None before that.
+    """
+    if len(d) < 14:
+        return None
+    if d[13] == "0":
+        if len(d) < 19:
+            return None
+        rtr, dlc, header = d[12], int(d[15:19], 2), 19
+    else:
+        if len(d) < 39:
+            return None
+        rtr, dlc, header = d[32], int(d[35:39], 2), 39
+    return header + (0 if rtr == "1" else 8 * min(dlc, 8)) + 15
+
+
+def decode_frame(s, sof):
+    """
+    Decode one frame starting at s[sof].
+
+    Returns (record, resume): a FRAME_DTYPE record (as a tuple) and
+    where to look for the next idle bus: the ACK delimiter after a good
+    frame (the recessive tail counts towards the idle time), the bit
+    after an error.
+    """
+    d = ""
+    search = q = sof
+    need = None
+    while True:
+        j = _next_run(s, search)
+        seg = s[q:j + STUFF_RUN]
+        if need is None:
+            need = _stuffed_length(d + seg)
+
+        done = need is not None and len(d) + len(seg) >= need
+        if done:
+            end = q + need - len(d)
+            d += s[q:end]
+            if end != j + STUFF_RUN:
+                break
+            # the CRC ends on a run of 5, so one more stuff bit follows
+        else:
+            d += seg
+
+        stuff_bit = j + STUFF_RUN
+        if stuff_bit >= len(s):
+            return _record(sof, d, TRUNCATED, len(s)), len(s)
+        if s[stuff_bit] == s[stuff_bit - 1]:
+            return _record(sof, d, STUFF_ERROR, stuff_bit), stuff_bit
+        search, q = stuff_bit, stuff_bit + 1
+        if done:
+            end = q
+            break
+
+    tail = s[end:end + 10]
+    if len(tail) < 10:
+        return _record(sof, d, TRUNCATED, len(s)), len(s)
+
+    crc_at = need - 15
+    if can_crc15(int(d[:crc_at], 2), crc_at) != int(d[crc_at:], 2):
+        error, at = CRC_ERROR, end
+    elif tail[0] != "1":
+        error, at = FORM_ERROR, end             # CRC delimiter
+    elif tail[1] != "0":
+        error, at = ACK_ERROR, end + 1          # nobody acknowledged
+    elif tail[2] != "1":
+        error, at = FORM_ERROR, end + 2         # ACK delimiter
+    elif tail[3:] != "1111111":
+        error, at = FORM_ERROR, end + 3 + tail[3:].index("0")
+    else:
+        return _record(sof, d, OK, -1), end + 2
+    return _record(sof, d, error, at), at
+
+
+def _record(sof, d, error, at):
+    """FRAME_DTYPE tuple from whatever part of the frame was decoded."""
+    extended = len(d) > 13 and d[13] == "1"
+    if extended:
+        id_bits, rtr_at, dlc_at, data_at = d[1:12] + d[14:32], 32, 35, 39
+    else:
+        id_bits, rtr_at, dlc_at, data_at = d[1:12], 12, 15, 19
+    id_val = int(id_bits, 2) if id_bits else 0
+    rtr = len(d) > rtr_at and d[rtr_at] == "1"
+    dlc = int(d[dlc_at:dlc_at + 4], 2) if len(d) >= dlc_at + 4 else 0
+
+    n_data = 0 if rtr else min(dlc, 8)
+    data_bits = d[data_at:data_at + 8 * n_data]
+    data = [0] * 8
+    for k in range(len(data_bits) // 8):
+        data[k] = int(data_bits[8 * k:8 * k + 8], 2)
+
+    crc_bits = d[data_at + 8 * n_data:data_at + 8 * n_data + 15]
+    crc = int(crc_bits, 2) if len(crc_bits) == 15 else -1
+    return (sof, id_val, extended, rtr, dlc, data, crc, error, at)
+
+
+def bits_to_str(bits):
+    """Array of 0/1 samples -> '0'/'1' string."""
+    return (np.asarray(bits, dtype=np.uint8) + ord("0")).tobytes().decode("ascii")
+
+
+def iter_frames(bits):
+    """
+    Decode every frame in a bit stream ('0'/'1' string or array of
+    0/1 samples). The stream is assumed to start on an idle bus.
+
+    After an error the decoder waits for the bus to go idle again.
+    Yields FRAME_DTYPE tuples.
+    """
+    s = bits if isinstance(bits, str) else bits_to_str(bits)
+    # pretend the bus was idle before the capture started
+    s = "1" * IDLE_BITS + s
+    idle = "1" * IDLE_BITS + "0"
+
+    pos = 0
+    while True:
+        at = s.find(idle, pos)
+        if at < 0:
+            return
+        sof = at + IDLE_BITS
+        rec, pos = decode_frame(s, sof)
+        # report positions in the caller's stream
+        start, *fields, error_bit = rec
+        yield (start - IDLE_BITS, *fields, error_bit - IDLE_BITS if error_bit >= 0 else -1)
+
+
+def decode_stream(bits):
+    """Returns (FRAME_DTYPE array of all frames, counts by error class)."""
+    frames = np.array(list(iter_frames(bits)), dtype=FRAME_DTYPE)
+    counts = Counter()
+    for code, n in zip(*np.unique(frames["error"], return_counts=True)):
+        counts[ERRORS[code]] += int(n)
+    return frames, counts
+
+
+def load_bits(filename):
+    """
+    A capture file: '0'/'1' text (.txt, whitespace ignored), or
+    packed bits, MSB first, 8 samples per byte.
+    """
+    if filename.endswith(".txt"):
+        with open(filename) as f:
+            return "".join(f.read().split())
+    return bits_to_str(np.unpackbits(np.fromfile(filename, dtype=np.uint8)))
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Decode a raw CAN bit-stream capture")
+    parser.add_argument("capture", help="packed bits, or '0'/'1' text with .txt")
+    parser.add_argument("--verbose", action="store_true", help="print every frame")
+    args = parser.parse_args()
+
+    frames, counts = decode_stream(load_bits(args.capture))
+    if args.verbose:
+        for f in frames:
+            n = 0 if f["rtr"] else min(int(f["dlc"]), 8)
+            id_text = f"{f['id']:08X}" if f["extended"] else f"{f['id']:03X}"
+            data = " ".join(f"{b:02X}" for b in f["data"][:n])
+            print(f"{f['start']:10d} {id_text} [{f['dlc']}] {data:24s} {ERRORS[f['error']]}")
+
+    print(f"{len(frames)} frames")
+    for name in ERRORS:
+        print(f"{name:12s}: {counts[name]}")
@@ -54,6 +54,38 @@ def calculate_crc(bits):
     return crc
 
 
+# calculate_crc is linear in (crc, input bits), so 8 steps of it are
+# crc = T_LO[crc & 0xFF] ^ T_HI[crc >> 8] ^ T_IN[byte]
+def _crc_feed_bits(crc, value, n):
+    for i in range(n - 1, -1, -1):
+        crc <<= 1
+        msb = (crc >> 14) & 1
+        crc = ((crc << 1) | ((value >> i) & 1)) & CRC_MASK
+        if msb:
+            crc ^= POLY
+    return crc
+
+CRC_TABLE_LO = [_crc_feed_bits(i, 0, 8) for i in range(256)]
+CRC_TABLE_HI = [_crc_feed_bits(i << 8, 0, 8) for i in range(1 << (CRC_BITS - 8))]
+CRC_TABLE_IN = [_crc_feed_bits(0, i, 8) for i in range(256)]
+
+def crc_bytes(data, crc=0):
+    t_lo, t_hi, t_in = CRC_TABLE_LO, CRC_TABLE_HI, CRC_TABLE_IN
+    for byte in data:
+        crc = t_lo[crc & 0xFF] ^ t_hi[crc >> 8] ^ t_in[byte]
+    return crc
+
+def calculate_frame_crc(id_val, dlc, data):
+    # same bits as frame_bytes_to_bits: SOF, 11 id bits, 000, 4 dlc bits
+    header = (id_val << 7) | (dlc & 0xF)
+    crc = _crc_feed_bits(0, header >> 16, 3)
+    crc = crc_bytes(((header >> 8) & 0xFF, header & 0xFF), crc)
+    return crc_bytes(data, crc)
+
+def hex_to_bytes(hex_string):
+    return [int(h, 16) & 0xFF for h in hex_string.strip().split()]
+
+
 def validate_row(row):
 
     id_hex = row['id'].strip()
@@ -82,8 +114,7 @@ def validate_row(row):
     provided_crc_hex = row.get('crc', '').strip()
     if provided_crc_hex:
         try:
-            bits = frame_bytes_to_bits(id_hex, dlc, data_hex)
-            computed_crc = calculate_crc(bits)
+            computed_crc = calculate_frame_crc(int(id_hex, 16), dlc, hex_to_bytes(data_hex))
             provided_crc = int(provided_crc_hex, 16) & CRC_MASK
             if computed_crc != provided_crc:
                 given_err = row.get('errors', 'none').strip().lower()
@@ -97,7 +128,8 @@ def validate_row(row):
     given_err = row.get('errors', 'none').strip().lower()
     print(f"The CAN frame check is success (error: none). The given error is {given_err}")
 
-with open('can_frames.csv', 'r') as f:
-    reader = csv.DictReader(f)
-    for row_num, row in enumerate(reader, start=2):
-        validate_row(row)
\ No newline at end of file
+if __name__ == "__main__":
+    with open('can_frames.csv', 'r') as f:
+        reader = csv.DictReader(f)
+        for row_num, row in enumerate(reader, start=2):
+            validate_row(row)
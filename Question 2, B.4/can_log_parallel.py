@@ -0,0 +1,113 @@
+import argparse
+import io
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from can_log_validator import (
+    ERRORS, RESULT_DTYPE, iter_results, read_columns,
+)
+
+
+def shard_ranges(filename, n_shards):
+    """
+    Split a CSV log into n_shards byte ranges of whole lines.
+
+    Returns (header line, [(start, stop), ...]) covering everything
+    after the header. Assumes no quoted field spans lines, which holds
+    for CAN logs.
+    """
+    with open(filename, 'rb') as f:
+        header = f.readline()
+        first = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        bounds = [first]
+        for i in range(1, n_shards):
+            # move each nominal boundary to the start of the next line
+            f.seek(max(first + (size - first) * i // n_shards - 1, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+        bounds.append(size)
+
+    header = _decode(header).read()
+    ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+    return header, ranges
+
+
+def _decode(raw):
+    """Bytes -> text stream, decoded like open(filename, 'r', newline='')."""
+    return io.TextIOWrapper(io.BytesIO(raw), newline='')
+
+
+def _validate_shard(job):
+    """Validate one byte range; rows are numbered from 0 within it."""
+    filename, start, stop, columns, chunk_rows, keep_results = job
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        raw = f.read(stop - start)
+
+    counts = Counter()
+    n_rows = 0
+    chunks = []
+    for results in iter_results(_decode(raw), chunk_rows, counts, first_row=0, columns=columns):
+        n_rows += len(results)
+        if keep_results:
+            chunks.append(results)
+    results = np.concatenate(chunks) if chunks else np.zeros(0, dtype=RESULT_DTYPE)
+    return results, n_rows, counts
+
+
+def iter_results_parallel(filename, workers=None, shards=None,
+                          chunk_rows=65536, counts=None, keep_results=True):
+    """
+    Validate a CSV log in a process pool.
+
+    The file is split into `shards` line-aligned byte ranges (default
+    4 per worker, so a slow shard doesn't hold up the rest); each is
+    validated independently. Yields one RESULT_DTYPE array per shard,
+    in file order, with row numbers as iter_results would give them.
+
+    With keep_results=False only the counts are sent back from the
+    workers and the yielded arrays are empty.
+    """
+    workers = workers or os.cpu_count()
+    header, ranges = shard_ranges(filename, shards or 4 * workers)
+    columns = read_columns(header)
+    jobs = [(filename, a, b, columns, chunk_rows, keep_results) for a, b in ranges]
+
+    row = 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results, n_rows, shard_counts in pool.map(_validate_shard, jobs):
+            results["row"] += row
+            row += n_rows
+            if counts is not None:
+                counts.update(shard_counts)
+            yield results
+
+
+def validate_file_parallel(filename, workers=None, shards=None, chunk_rows=65536):
+    """validate_file on several cores. Returns (all results, counts)."""
+    counts = Counter()
+    chunks = list(iter_results_parallel(filename, workers, shards, chunk_rows, counts))
+    results = np.concatenate(chunks) if chunks else np.zeros(0, dtype=RESULT_DTYPE)
+    return results, counts
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Validate a CAN frame CSV log on several cores")
+    parser.add_argument("log", nargs="?", default="can_frames.csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shards", type=int, help="default: 4 per worker")
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    args = parser.parse_args()
+
+    counts = Counter()
+    for _ in iter_results_parallel(args.log, args.workers, args.shards,
+                                   args.chunk_rows, counts, keep_results=False):
+        pass
+
+    print(f"{sum(counts.values())} frames")
+    for name in ERRORS:
+        print(f"{name:22s}: {counts[name]}")
@@ -0,0 +1,319 @@
+import argparse
+import csv
+import itertools
+from collections import Counter
+import numpy as np
+from can_frames_error_detection_ED25B041 import (
+    CRC_MASK, POLY, CRC_TABLE_LO, CRC_TABLE_HI, CRC_TABLE_IN,
+)
+
+
+# error classes in the order validate_row checks them
+ERRORS = ("none", "bad id", "bad dlc", "data length mismatch", "bad crc")
+OK, BAD_ID, BAD_DLC, BAD_LENGTH, BAD_CRC = range(len(ERRORS))
+
+# crc column values that aren't a CRC
+NO_CRC = -1     # column empty: CRC not checked
+BAD_CRC_FIELD = -2  # crc or data hex unparsable: always a CRC error
+
+RESULT_DTYPE = np.dtype([
+    ("row", "i8"),          # line number in the file (header is line 1)
+    ("id", "i8"),           # -1 if unparsable
+    ("dlc", "i8"),          # -1 if unparsable
+    ("error", "u1"),        # index into ERRORS
+    ("crc", "i4"),          # computed CRC, -1 if not computed
+    ("given", "O"),         # the log's own 'errors' column, as str
+])
+
+
+def new_results(n):
+    """n blank RESULT_DTYPE records (np.zeros would make 'given' 0)."""
+    res = np.zeros(n, dtype=RESULT_DTYPE)
+    res["given"] = ""
+    return res
+
+
+_T_LO = np.array(CRC_TABLE_LO, dtype=np.int32)
+_T_HI = np.array(CRC_TABLE_HI, dtype=np.int32)
+_T_IN = np.array(CRC_TABLE_IN, dtype=np.int32)
+
+
+########################## ARRAY CORE ##########################
+
+def crc_frames(ids, dlcs, data):
+    """
+    calculate_frame_crc for N frames at once.
+
+    ids, dlcs : (N,) ints (ids within 11 bits, dlcs within 0..8)
+    data      : (N, 8) uint8, only the first dlc bytes of a row are used
+    """
+    ids = np.asarray(ids, dtype=np.int32)
+    dlcs = np.asarray(dlcs, dtype=np.int32)
+    header = (ids << 7) | (dlcs & 0xF)
+
+    # first 3 of the 19 header bits one at a time
+    crc = np.zeros(len(ids), dtype=np.int32)
+    for i in (18, 17, 16):
+        msb = (crc >> 13) & 1
+        crc = ((crc << 2) | ((header >> i) & 1)) & CRC_MASK
+        crc ^= msb * POLY
+
+    for byte in ((header >> 8) & 0xFF, header & 0xFF):
+        crc = _T_LO[crc & 0xFF] ^ _T_HI[crc >> 8] ^ _T_IN[byte]
+
+    for k in range(data.shape[1]):
+        active = dlcs > k
+        if not active.any():
+            break
+        step = _T_LO[crc & 0xFF] ^ _T_HI[crc >> 8] ^ _T_IN[data[:, k]]
+        crc = np.where(active, step, crc)
+    return crc
+
+
+def check_frames(ids, dlcs, n_data, data, crcs):
+    """
+    The validate_row checks for N frames at once.
+
+    ids    : (N,) ints, -1 if unparsable
+    dlcs   : (N,) ints, -1 if unparsable
+    n_data : (N,) number of data bytes actually present
+    data   : (N, 8) uint8 data bytes
+    crcs   : (N,) given CRC, NO_CRC or BAD_CRC_FIELD
+
+    Returns (error (N,) uint8 indices into ERRORS, computed crc (N,),
+    -1 where the CRC wasn't computed).
+    """
+    ids = np.asarray(ids)
+    dlcs = np.asarray(dlcs)
+    n_data = np.asarray(n_data)
+    crcs = np.asarray(crcs)
+
+    error = np.full(len(ids), OK, dtype=np.uint8)
+    computed = np.full(len(ids), -1, dtype=np.int32)
+
+    # later checks only apply where the earlier ones passed, so
+    # assign in reverse order and let earlier errors overwrite
+    id_ok = (ids >= 0) & (ids <= 0x7FF)
+    dlc_ok = (dlcs >= 0) & (dlcs <= 8)
+    len_ok = n_data == dlcs
+    has_crc = crcs != NO_CRC
+
+    check = id_ok & dlc_ok & len_ok & has_crc
+    if check.any():
+        computed[check] = crc_frames(ids[check], dlcs[check], data[check])
+        error[check & (computed != crcs)] = BAD_CRC
+
+    error[~len_ok] = BAD_LENGTH
+    error[~dlc_ok] = BAD_DLC
+    error[~id_ok] = BAD_ID
+    return error, computed
+
+
+########################## CSV PARSING ##########################
+
+def _parse_int(text, base):
+    try:
+        return int(text, base)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _parse_crc(text):
+    try:
+        return int(text, 16) & CRC_MASK
+    except ValueError:
+        return BAD_CRC_FIELD
+
+
+def _parse_ints(texts, base, lo, hi):
+    """
+    Column of int strings -> int64 array, -1 where a value doesn't
+    parse or is outside lo..hi.
+    """
+    try:
+        values = [int(t, base) for t in texts]
+    except (TypeError, ValueError):
+        values = [_parse_int(t, base) for t in texts]
+    try:
+        values = np.array(values, dtype=np.int64)
+    except OverflowError:
+        values = np.array([min(max(v, -1), hi + 1) for v in values], dtype=np.int64)
+    values[(values < lo) | (values > hi)] = -1
+    return values
+
+
+def _parse_data(texts, counts):
+    """
+    Hex data strings -> (bytes of all tokens concatenated, ok (N,) bool).
+    Rows whose tokens don't parse contribute no bytes.
+    """
+    try:
+        # fast path for the usual "0A 1B 2C" layout: only succeeds
+        # with the right length if every token is exactly two digits
+        raw = bytes.fromhex(" ".join(texts))
+        if len(raw) == sum(counts):
+            return raw, np.ones(len(texts), dtype=bool)
+    except ValueError:
+        pass
+
+    raw = bytearray()
+    ok = np.ones(len(texts), dtype=bool)
+    for i, (text, count) in enumerate(zip(texts, counts)):
+        try:
+            row = bytes.fromhex(text)
+            if len(row) == count:
+                raw += row
+                continue
+        except ValueError:
+            pass
+        try:
+            raw += bytes(int(h, 16) & 0xFF for h in text.split())
+        except ValueError:
+            ok[i] = False
+    return bytes(raw), ok
+
+
+def parse_rows(rows, columns, first_row):
+    """
+    CSV rows (lists of strings) -> results array with id/dlc/given
+    filled in, plus the (n_data, data, crcs) arrays for check_frames.
+    """
+    n = len(rows)
+    width = max(i for i in columns if i is not None) + 1
+    if min(map(len, rows)) < width:
+        rows = [row + [""] * (width - len(row)) for row in rows]
+
+    def column(i, default=""):
+        return [row[i] for row in rows] if i is not None else [default] * n
+
+    i_id, i_dlc, i_data, i_crc, i_err = columns
+    res = new_results(n)
+    res["row"] = np.arange(first_row, first_row + n)
+    res["id"] = _parse_ints(column(i_id), 16, 0, 2 ** 31 - 1)
+    res["dlc"] = dlcs = _parse_ints(column(i_dlc), 10, 0, 2 ** 31 - 1)
+    res["given"] = [t.strip().lower() for t in column(i_err, "none")]
+
+    texts = column(i_data)
+    n_data = np.array([len(t.split()) for t in texts], dtype=np.int64)
+
+    # CRC fields are only parsed where validate_row would get that far
+    crc_texts = [t.strip() for t in column(i_crc)]
+    has_crc = np.array([t != "" for t in crc_texts], dtype=bool)
+    todo = np.flatnonzero(has_crc & (n_data == dlcs) & (n_data <= 8))
+
+    crcs = np.full(n, NO_CRC, dtype=np.int64)
+    crcs[todo] = [_parse_crc(crc_texts[i]) for i in todo]
+
+    raw, ok = _parse_data([texts[i] for i in todo], n_data[todo].tolist())
+    crcs[todo[~ok]] = BAD_CRC_FIELD
+
+    # scatter the concatenated bytes into an (N, 8) table
+    data = np.zeros((n, 8), dtype=np.uint8)
+    good = todo[ok]
+    counts = n_data[good]
+    rows_of = np.repeat(good, counts)
+    cols_of = np.arange(len(rows_of)) - np.repeat(np.cumsum(counts) - counts, counts)
+    data[rows_of, cols_of] = np.frombuffer(raw, dtype=np.uint8)
+    return res, n_data, data, crcs
+
+
+def _columns(header):
+    names = [h.strip().lower() for h in header]
+    return [
+        names.index(name) if name in names else None
+        for name in ("id", "dlc", "data", "crc", "errors")
+    ]
+
+
+########################## API ##########################
+
+def read_columns(header_line):
+    """Column indices of id, dlc, data, crc, errors (None if missing)."""
+    return _columns(next(csv.reader([header_line])))
+
+
+def iter_results(f, chunk_rows=65536, counts=None, first_row=2, columns=None):
+    """
+    Validate an open CAN CSV log chunk by chunk.
+
+    Yields RESULT_DTYPE arrays of up to chunk_rows frames. If a Counter
+    is given, it is updated with the number of frames per error class.
+    The header is read from f unless its columns are given (see
+    read_columns), e.g. when f starts in the middle of a log.
+    """
+    reader = csv.reader(f)
+    if columns is None:
+        columns = _columns(next(reader))
+    row = first_row
+    while True:
+        rows = list(itertools.islice(reader, chunk_rows))
+        if not rows:
+            return
+        res, n_data, data, crcs = parse_rows(rows, columns, row)
+        res["error"], res["crc"] = check_frames(res["id"], res["dlc"], n_data, data, crcs)
+        if counts is not None:
+            count_errors(res, counts)
+        row += len(rows)
+        yield res
+
+
+def count_errors(results, counts=None):
+    """Counter of frames per error class name."""
+    counts = Counter() if counts is None else counts
+    for code, n in zip(*np.unique(results["error"], return_counts=True)):
+        counts[ERRORS[code]] += int(n)
+    return counts
+
+
+def validate_file(filename, chunk_rows=65536):
+    """Returns (all results, counts by error class)."""
+    counts = Counter()
+    with open(filename, 'r', newline='') as f:
+        chunks = list(iter_results(f, chunk_rows, counts))
+    results = np.concatenate(chunks) if chunks else np.zeros(0, dtype=RESULT_DTYPE)
+    return results, counts
+
+
+def describe(rec):
+    """The validate_row message for one result record."""
+    error = ERRORS[rec["error"]]
+    status = "success" if rec["error"] == OK else "failure"
+    return f"The CAN frame check is {status} (error: {error}). The given error is {rec['given']}"
+
+
+def write_results(results, filename):
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["row", "id", "dlc", "error", "crc", "given"])
+        for rec in results.tolist():
+            row, id_val, dlc, error, crc, given = rec
+            writer.writerow([
+                row,
+                f"{id_val:03X}" if id_val >= 0 else "",
+                dlc if dlc >= 0 else "",
+                ERRORS[error],
+                f"{crc:04X}" if crc >= 0 else "",
+                given,
+            ])
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Validate a CAN frame CSV log")
+    parser.add_argument("log", nargs="?", default="can_frames.csv")
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    parser.add_argument("--out", help="write per-frame results to this CSV")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print the validate_row message for every frame")
+    args = parser.parse_args()
+
+    results, counts = validate_file(args.log, args.chunk_rows)
+    if args.verbose:
+        for rec in results:
+            print(describe(rec))
+    if args.out:
+        write_results(results, args.out)
+
+    print(f"{len(results)} frames")
+    for name in ERRORS:
+        print(f"{name:22s}: {counts[name]}")
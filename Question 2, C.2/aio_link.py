@@ -0,0 +1,281 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import arq
+import framing
+from framing import DATA
+
+# asyncio transport for framing.py frames, so one event loop can run
+# many serial links without a thread per direction.
+#
+# Ports with a file descriptor (pyserial on Linux/macOS, ptys) are read
+# and written from the event loop itself via add_reader/add_writer.
+# Others (pyserial on Windows, transport.LoopbackPort) get one thread
+# each, doing blocking reads with the port's timeout.
+#
+# Both directions go through bounded queues: a full send queue makes
+# send() wait, and a full receive queue stops reading the port until
+# the consumer catches up.
+
+
+class AsyncLink:
+    def __init__(self, ser, max_queue=64, corrupt_p=0.0, read_size=4096):
+        """
+        Frames over a serial-like port (see transport.py), for asyncio.
+
+            async with AsyncLink(ser) as link:
+                await link.send_pwm(pwm)
+                async for kind, seq, payload in link:
+                    ...
+
+        max_queue : frames buffered each way before backpressure
+        corrupt_p : per-byte reset probability applied to every frame
+                    sent (see BYTE_RESET_PROBABLITY)
+
+        Without a file descriptor the port needs a finite read timeout:
+        it is how long closing waits for the reader thread.
+
+        If writing to the port fails, the frames still queued are dropped
+        and send(), drain() and close() raise the error.
+        """
+        self.ser = ser
+        self.max_queue = max_queue
+        self.corrupt_p = corrupt_p
+        self.read_size = read_size
+        self.receiver = framing.FrameReceiver(ser, read_size=read_size)
+
+        try:
+            self.fd = ser.fileno()
+        except (AttributeError, OSError, ValueError):
+            self.fd = None
+
+        self.seq = 0            # next seq for send() without one
+        self.error = None       # what ended the reader, if anything
+        self.write_error = None # what ended the writer, if anything
+        self._was_blocking = None
+        self._eof = False
+        self._pending = None    # recv() get carried over a timeout
+        self._tasks = []
+        self._executor = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, *exc):
+        try:
+            await self.close()
+        except (OSError, ValueError):
+            # don't replace the exception that ended the block
+            if exc_type is None:
+                raise
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._rx = asyncio.Queue(self.max_queue)
+        self._tx = asyncio.Queue(self.max_queue)
+        if self.fd is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="aio_link")
+        else:
+            self._was_blocking = os.get_blocking(self.fd)
+            os.set_blocking(self.fd, False)
+        self._tasks = [self.loop.create_task(self._reader()),
+                       self.loop.create_task(self._writer())]
+
+    async def close(self):
+        """Send what's queued, then stop. Raises write_error if set."""
+        if not self._tasks[1].done():
+            # a failed writer still empties the queue, so this returns
+            await self._tx.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pending is not None:
+            self._pending.cancel()
+        if self._executor is not None:
+            # the reader thread finishes its current read first
+            await self.loop.run_in_executor(None, self._executor.shutdown)
+        if self._was_blocking is not None:
+            try:
+                os.set_blocking(self.fd, self._was_blocking)
+            except OSError:
+                pass            # fd already closed
+            self._was_blocking = None
+        self._raise_write_error()
+
+    ########################## SENDING ##########################
+
+    def _raise_write_error(self):
+        if self.write_error is not None:
+            raise self.write_error
+
+    async def send(self, payload, seq=None, kind=DATA):
+        """Queue a frame; waits while the send queue is full."""
+        self._raise_write_error()
+        if seq is None:
+            seq = self.seq
+            self.seq = (self.seq + 1) % arq.SEQ_SPACE
+        frame = arq.corrupt(framing.encode_frame(payload, seq, kind), self.corrupt_p)
+        await self._tx.put(frame)
+        # the writer may have failed while this waited for room
+        self._raise_write_error()
+
+    async def send_pwm(self, data, seq=None):
+        """A PWM array as one DATA frame, like send_data()."""
+        await self.send(np.asarray(data).astype(np.uint8).tobytes(), seq)
+
+    async def drain(self):
+        """Wait until every queued frame has been written to the port."""
+        await self._tx.join()
+        self._raise_write_error()
+
+    async def _writer(self):
+        while True:
+            frame = await self._tx.get()
+            try:
+                if self.write_error is not None:
+                    pass            # dropped: the port is gone
+                elif self.fd is None:
+                    await self.loop.run_in_executor(None, self.ser.write, frame)
+                else:
+                    await self._write_fd(frame)
+            except (OSError, ValueError) as e:
+                # closed or unplugged port; keep taking frames so that
+                # join() and a send() waiting on a full queue return
+                self.write_error = e
+            finally:
+                self._tx.task_done()
+
+    async def _write_fd(self, frame):
+        view = memoryview(frame)
+        while view:
+            try:
+                view = view[os.write(self.fd, view):]
+            except BlockingIOError:
+                pass
+            if view:
+                await self._ready(self.loop.add_writer, self.loop.remove_writer)
+
+    ########################## RECEIVING ##########################
+
+    async def _ready(self, add, remove):
+        """Wait for the event loop to report the port readable/writable."""
+        ready = self.loop.create_future()
+        add(self.fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            remove(self.fd)
+
+    def _blocking_read(self):
+        waiting = self.ser.in_waiting
+        return self.ser.read(max(1, min(waiting, self.read_size)))
+
+    async def _reader(self):
+        try:
+            while True:
+                if self.fd is None:
+                    data = await self.loop.run_in_executor(self._executor, self._blocking_read)
+                else:
+                    await self._ready(self.loop.add_reader, self.loop.remove_reader)
+                    try:
+                        data = os.read(self.fd, self.read_size)
+                    except BlockingIOError:
+                        continue
+                    if not data:
+                        break           # end of file
+                if data:
+                    self.receiver.feed(data)
+                    for frame in self.receiver.frames():
+                        await self._rx.put(frame)
+        except (OSError, ValueError) as e:
+            # closed or unplugged port (SerialException is an OSError)
+            self.error = e
+        await self._rx.put(None)
+
+    async def recv(self, timeout=None):
+        """
+        Next good frame as (kind, seq, payload), None if timeout seconds
+        pass first. Raises EOFError once the port is gone.
+        """
+        if self._eof:
+            raise EOFError(self.error or "port closed")
+        if self._pending is None:
+            self._pending = self.loop.create_task(self._rx.get())
+        # a get that times out is kept for the next call, so no frame
+        # is lost to a cancellation
+        done, _ = await asyncio.wait({self._pending}, timeout=timeout)
+        if not done:
+            return None
+        frame = self._pending.result()
+        self._pending = None
+        if frame is None:
+            self._eof = True
+            raise EOFError(self.error or "port closed")
+        return frame
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.recv()
+        except EOFError:
+            raise StopAsyncIteration
+
+
+########################## ARQ ##########################
+
+async def arq_send(link, payloads, window=32, on_ack=None, on_send=None, **rto):
+    """
+    arq.ArqSender.send_all over an AsyncLink; returns the sender for
+    its counters. Timers are checked when they expire, not on a poll.
+    """
+    sender = arq.ArqSender(None, window, **rto)
+    sender.start(payloads, on_ack, on_send)
+    while not sender.done:
+        for frame in sender.due():
+            await link.send(*frame)
+        frame = await link.recv(sender.next_timeout())
+        if frame is not None:
+            for reply in sender.on_frame(*frame):
+                await link.send(*reply)
+    return sender
+
+
+async def arq_receive(link, count, window=32, linger=0.5, idle_timeout=10.0):
+    """arq.ArqReceiver.receive over an AsyncLink, as an async generator."""
+    receiver = arq.ArqReceiver(None, window)
+    delivered = 0
+    last_data = time.monotonic()
+    next_final = None
+    while True:
+        now = time.monotonic()
+        wait = idle_timeout - (now - last_data)
+        if delivered >= count:
+            wait = min(wait, linger - (now - last_data))
+        if wait <= 0:
+            return
+        if next_final is not None:
+            if now >= next_final:
+                for reply in receiver.final_ack():
+                    await link.send(*reply)
+                next_final = now + linger / arq.FINAL_ACKS
+            wait = min(wait, next_final - now)
+
+        frame = await link.recv(wait)
+        if frame is None:
+            continue
+        if frame[0] == DATA:
+            last_data = time.monotonic()
+        for reply in receiver.on_frame(*frame):
+            await link.send(*reply)
+
+        for payload in receiver.ready():
+            if delivered < count:
+                delivered += 1
+                if delivered == count:
+                    next_final = time.monotonic()
+                yield payload
@@ -0,0 +1,310 @@
+import time
+import numpy as np
+import framing
+from framing import DATA, ACK, NACK
+
+# Selective-repeat ARQ over a framing.py link.
+#
+# The sender keeps up to `window` DATA frames in flight, each with its
+# own retransmission timer. The receiver ACKs every DATA frame it gets,
+# buffers out-of-order ones, NACKs the gaps in front of them and
+# delivers payloads in order. Sequence numbers are 8 bit, so the
+# window can be at most half of that.
+
+SEQ_SPACE = 256
+MAX_WINDOW = SEQ_SPACE // 2
+FINAL_ACKS = 4      # repeats of the last ACK while the receiver lingers
+
+
+def corrupt(frame, p):
+    """Reset bytes to 0x00 with probability p (the link's noise model)."""
+    if p <= 0:
+        return frame
+    frame = np.frombuffer(frame, dtype=np.uint8).copy()
+    frame[np.random.random(len(frame)) < p] = 0x00
+    return frame.tobytes()
+
+
+class RttEstimator:
+    def __init__(self, rto_init=1.0, rto_min=0.05, rto_max=4.0):
+        """
+        Retransmission timeout from smoothed round-trip times, as in
+        TCP (RFC 6298): rto = srtt + 4 * rttvar, doubled on timeouts.
+        """
+        self.rto_min = rto_min
+        self.rto_max = rto_max
+        self.srtt = None
+        self.rttvar = None
+        self.rto = rto_init
+
+    def sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.rto = min(max(self.srtt + 4 * self.rttvar, self.rto_min), self.rto_max)
+
+    def backoff(self):
+        self.rto = min(2 * self.rto, self.rto_max)
+
+
+class ArqSender:
+    def __init__(self, ser, window=32, rto_init=1.0, rto_min=0.05, rto_max=4.0,
+                 corrupt_p=0.0):
+        """
+        Reliable sender over a full-duplex serial-like port.
+
+        ACKs are read with the port's own read timeout, which is also
+        how often retransmission timers are checked, so open the port
+        with a short timeout (a few ms).
+
+        send_all() drives the transfer on the port. The protocol itself
+        is in start() / due() / on_frame(), which do no I/O, so other
+        drivers can run it (aio_link.arq_send, with ser=None).
+
+        window    : DATA frames in flight, at most MAX_WINDOW
+        corrupt_p : per-byte reset probability applied to every frame
+                    sent (see BYTE_RESET_PROBABLITY)
+        """
+        if not 0 < window <= MAX_WINDOW:
+            raise ValueError(f"window must be in 1..{MAX_WINDOW}")
+        self.ser = ser
+        self.window = window
+        self.corrupt_p = corrupt_p
+        self.rtt = RttEstimator(rto_init, rto_min, rto_max)
+        self.receiver = framing.FrameReceiver(ser)
+
+        self.sent = 0
+        self.retransmitted = 0
+        self.nacks = 0
+        self.start([])
+
+    def start(self, payloads, on_ack=None, on_send=None):
+        """Begin a transfer of payloads (bytes); see send_all."""
+        self.payloads = list(payloads)
+        self.on_ack = on_ack
+        self.on_send = on_send
+        self.base = 0           # oldest unacknowledged payload
+        self.next_seq = 0       # next payload to send for the first time
+        self.sent_at = {}       # payload index -> time of last transmission
+        self.order = {}         # payload index -> self.sent at last transmission
+        self.retried = set()    # retransmitted: no RTT samples (Karn)
+        self.acked = set()
+
+    @property
+    def done(self):
+        return self.base >= len(self.payloads)
+
+    def _transmit(self, i):
+        self.sent_at[i] = time.monotonic()
+        self.order[i] = self.sent
+        self.sent += 1
+        return self.payloads[i], i % SEQ_SPACE, DATA
+
+    def _retransmit(self, i):
+        self.retried.add(i)
+        self.retransmitted += 1
+        return self._transmit(i)
+
+    def _ack(self, i):
+        self.acked.add(i)
+        if i not in self.retried:
+            self.rtt.sample(time.monotonic() - self.sent_at[i])
+        if self.on_ack:
+            self.on_ack(i)
+
+    def due(self):
+        """
+        Frames to send now, as (payload, seq, kind): new ones the window
+        has room for, then those whose timer expired.
+        """
+        frames = []
+        n = len(self.payloads)
+        while self.next_seq < n and self.next_seq < self.base + self.window:
+            if self.on_send:
+                self.on_send(self.next_seq)
+            frames.append(self._transmit(self.next_seq))
+            self.next_seq += 1
+
+        now = time.monotonic()
+        expired = [i for i in range(self.base, self.next_seq)
+                   if i not in self.acked and now - self.sent_at[i] >= self.rtt.rto]
+        frames += [self._retransmit(i) for i in expired]
+        if expired:
+            self.rtt.backoff()
+        return frames
+
+    def next_timeout(self):
+        """Seconds until the next retransmission timer expires, None if none runs."""
+        pending = [self.sent_at[i] for i in range(self.base, self.next_seq)
+                   if i not in self.acked]
+        if not pending:
+            return None
+        return max(0.0, min(pending) + self.rtt.rto - time.monotonic())
+
+    def on_frame(self, kind, seq, payload):
+        """Handle a received ACK/NACK. Returns frames to send, like due()."""
+        base, next_seq = self.base, self.next_seq
+        # map the 8-bit seq onto the frames in flight
+        i = base + (seq - base) % SEQ_SPACE
+        if i >= next_seq or i in self.acked:
+            return []
+
+        frames = []
+        if kind == NACK:
+            # only if it hasn't been resent since the frame whose
+            # arrival showed the gap (that frame's ACK may
+            # already have triggered it)
+            self.nacks += 1
+            after = base + (payload[0] - base) % SEQ_SPACE if payload else next_seq
+            if after >= next_seq or self.order[i] < self.order[after]:
+                frames.append(self._retransmit(i))
+            return frames
+        if kind != ACK:
+            return frames
+
+        self._ack(i)
+        # everything before the receiver's next expected payload
+        # has arrived, even if those ACKs were lost
+        if payload:
+            upto = base + (payload[0] - base) % SEQ_SPACE
+            for j in range(base, min(upto, next_seq)):
+                if j not in self.acked:
+                    self._ack(j)
+        # the link keeps order, so a frame sent before one that
+        # got through, and still unACKed, was lost
+        for j in range(base, next_seq):
+            if j not in self.acked and self.order[j] < self.order[i]:
+                frames.append(self._retransmit(j))
+
+        while self.base in self.acked:
+            self.acked.discard(self.base)
+            self.retried.discard(self.base)
+            del self.sent_at[self.base], self.order[self.base]
+            self.base += 1
+        return frames
+
+    def _write(self, frames):
+        for payload, seq, kind in frames:
+            frame = framing.encode_frame(payload, seq, kind)
+            self.ser.write(corrupt(frame, self.corrupt_p))
+
+    def send_all(self, payloads, on_ack=None, on_send=None):
+        """
+        Deliver every payload (bytes), in order. Blocks until all of
+        them are acknowledged. on_send(i) is called as payload i first
+        goes out, on_ack(i) as it is ACKed.
+        """
+        self.start(payloads, on_ack, on_send)
+        while not self.done:
+            self._write(self.due())
+            for frame in self.receiver.poll():
+                self._write(self.on_frame(*frame))
+
+
+class ArqReceiver:
+    def __init__(self, ser, window=32, corrupt_p=0.0):
+        """
+        Receiving end of ArqSender, same window size.
+
+        Like the sender, receive() drives it on the port and
+        on_frame() / ready() are the I/O-free protocol.
+
+        corrupt_p : per-byte reset probability applied to ACK/NACK frames
+        """
+        if not 0 < window <= MAX_WINDOW:
+            raise ValueError(f"window must be in 1..{MAX_WINDOW}")
+        self.ser = ser
+        self.window = window
+        self.corrupt_p = corrupt_p
+        self.receiver = framing.FrameReceiver(ser)
+
+        self.base = 0       # next payload to deliver
+        self.buffered = {}  # out-of-order payloads by index
+        self.nacked = set()
+
+    def on_frame(self, kind, seq, payload):
+        """Handle a received frame. Returns ACK/NACK frames to send as (payload, seq, kind)."""
+        if kind != DATA:
+            return []
+        offset = (seq - self.base) % SEQ_SPACE
+        if offset >= self.window:
+            # already delivered: our ACK was lost, send it again
+            if SEQ_SPACE - offset <= self.window:
+                return [(bytes([self.base % SEQ_SPACE]), seq, ACK)]
+            return []
+
+        i = self.base + offset
+        self.buffered.setdefault(i, payload)
+        self.nacked.discard(i)
+
+        # ACKs also carry the next payload still missing, so one that
+        # gets through covers any ACKs lost before it
+        expected = self.base
+        while expected in self.buffered:
+            expected += 1
+        replies = [(bytes([expected % SEQ_SPACE]), i % SEQ_SPACE, ACK)]
+
+        # NACKs carry the seq whose arrival showed the gap
+        for missing in range(self.base, i):
+            if missing not in self.buffered and missing not in self.nacked:
+                replies.append((bytes([seq]), missing % SEQ_SPACE, NACK))
+                self.nacked.add(missing)
+        return replies
+
+    def final_ack(self):
+        """
+        ACK for the last payload delivered, covering all before it:
+        lets a sender whose last ACKs were lost finish without waiting
+        out its retransmission timeout.
+        """
+        return [(bytes([self.base % SEQ_SPACE]), (self.base - 1) % SEQ_SPACE, ACK)]
+
+    def ready(self):
+        """Take the payloads that can now be delivered in order."""
+        payloads = []
+        while self.base in self.buffered:
+            payloads.append(self.buffered.pop(self.base))
+            self.base += 1
+        return payloads
+
+    def _write(self, frames):
+        for payload, seq, kind in frames:
+            frame = framing.encode_frame(payload, seq, kind)
+            self.ser.write(corrupt(frame, self.corrupt_p))
+
+    def receive(self, count, linger=0.5, idle_timeout=10.0):
+        """
+        Yield `count` payloads in order.
+
+        Afterwards keeps answering for `linger` seconds of quiet, in
+        case the last ACKs were lost and the sender is retransmitting,
+        and repeats the final ACK FINAL_ACKS times over that period.
+        Stops early if nothing arrives for idle_timeout seconds.
+        """
+        delivered = 0
+        last_data = time.monotonic()
+        next_final = None
+        while True:
+            now = time.monotonic()
+            if delivered >= count and now - last_data >= linger:
+                return
+            if now - last_data >= idle_timeout:
+                return
+            if next_final is not None and now >= next_final:
+                self._write(self.final_ack())
+                next_final = now + linger / FINAL_ACKS
+
+            for frame in self.receiver.poll():
+                if frame[0] == DATA:
+                    last_data = time.monotonic()
+                self._write(self.on_frame(*frame))
+
+            for payload in self.ready():
+                if delivered < count:
+                    delivered += 1
+                    if delivered == count:
+                        next_final = time.monotonic()
+                    yield payload
@@ -0,0 +1,195 @@
+############################
+# Serial link benchmark
+#
+# Runs the send/receive pipeline over an in-memory LoopbackLink (see
+# transport.py), so it needs no serial ports, and reports goodput,
+# per-frame latency percentiles and the frame error rate:
+#
+#   python benchmark_link.py                          # every mode
+#   python benchmark_link.py --mode arq --baud 9600 --corrupt 0.005
+#
+# raw : send_data / receive_data one frame at a time, no retransmission;
+#       latency is write to decode
+# arq : arq.ArqSender / ArqReceiver with their window; latency is first
+#       transmission to in-order delivery
+# aio : the same ARQ on aio_link.AsyncLink, both ends in one event loop
+############################
+
+import argparse
+import asyncio
+import threading
+import time
+import numpy as np
+import aio_link
+import arq
+import framing
+import send_and_receive_ED25B041 as link_app
+from transport import BITS_PER_BYTE, LoopbackLink
+
+
+def make_payloads(frames, size, seed=0):
+    """PWM arrays like generate_pwm(), as bytes."""
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 255, size, dtype=np.uint8).tobytes() for _ in range(frames)]
+
+
+def run_raw(link, payloads, timeout=0.5):
+    """
+    Each payload sent once. Returns (received payloads by index, latencies,
+    seconds until the last frame was on the wire, frames the receiver saw
+    damaged).
+    """
+    sent_at = {}
+    received = {}
+    latencies = []
+
+    tx = link.open(link.names[0], timeout=timeout)
+    rx = link.open(link.names[1], timeout=timeout)
+    receiver = framing.FrameReceiver(rx)
+
+    def receive():
+        last = -1
+        while True:
+            frame = receiver.read_frame()
+            if frame is None:
+                return
+            kind, seq, payload = frame
+            # frames arrive in order: map the 8-bit seq past the last one
+            i = last + 1 + (seq - last - 1) % arq.SEQ_SPACE
+            latencies.append(time.monotonic() - sent_at[i])
+            received[i] = payload
+            last = i
+
+    thread = threading.Thread(target=receive)
+    thread.start()
+    start = time.monotonic()
+    for i, payload in enumerate(payloads):
+        sent_at[i] = time.monotonic()
+        # the noise comes from the link, not from send_data
+        link_app.send_data(tx, np.frombuffer(payload, dtype=np.uint8), seq=i, corrupt_p=0.0)
+        # one frame on the wire at a time, so latency isn't queueing
+        tx.flush()
+    elapsed = time.monotonic() - start
+    tx.close()
+    thread.join()
+    rx.close()
+    return received, latencies, elapsed, receiver.bad
+
+
+def run_arq(link, payloads, window, timeout=0.01):
+    """
+    ARQ transfer. Returns (received payloads by index, latencies,
+    seconds until the last delivery, transmissions, DATA frames that
+    arrived intact).
+    """
+    first_sent = {}
+    received = {}
+    latencies = []
+    delivered_at = [None]
+
+    tx = link.open(link.names[0], timeout=timeout)
+    rx = link.open(link.names[1], timeout=timeout)
+    sender = arq.ArqSender(tx, window)
+    receiver = arq.ArqReceiver(rx, window)
+
+    def receive():
+        for i, payload in enumerate(receiver.receive(len(payloads), linger=0.2)):
+            latencies.append(time.monotonic() - first_sent[i])
+            received[i] = payload
+            delivered_at[0] = time.monotonic()
+
+    thread = threading.Thread(target=receive)
+    thread.start()
+    start = time.monotonic()
+    sender.send_all(payloads, on_send=lambda i: first_sent.__setitem__(i, time.monotonic()))
+    thread.join()
+    tx.close()
+    rx.close()
+    elapsed = (delivered_at[0] or time.monotonic()) - start
+    return received, latencies, elapsed, sender.sent, receiver.receiver.good
+
+
+def run_aio(link, payloads, window, timeout=0.01):
+    """run_arq with both ends on AsyncLinks in one event loop."""
+    first_sent = {}
+    received = {}
+    latencies = []
+    delivered_at = [None]
+
+    async def transfer():
+        with link.open(link.names[0], timeout=timeout) as tx, \
+                link.open(link.names[1], timeout=timeout) as rx:
+            async with aio_link.AsyncLink(tx) as tx_link, aio_link.AsyncLink(rx) as rx_link:
+
+                async def receive():
+                    async for payload in aio_link.arq_receive(rx_link, len(payloads), window, linger=0.2):
+                        i = len(received)
+                        latencies.append(time.monotonic() - first_sent[i])
+                        received[i] = payload
+                        delivered_at[0] = time.monotonic()
+
+                receiving = asyncio.ensure_future(receive())
+                start = time.monotonic()
+                sender = await aio_link.arq_send(
+                    tx_link, payloads, window,
+                    on_send=lambda i: first_sent.__setitem__(i, time.monotonic()))
+                await receiving
+                frames_good = rx_link.receiver.good
+        elapsed = (delivered_at[0] or time.monotonic()) - start
+        return received, latencies, elapsed, sender.sent, frames_good
+
+    return asyncio.run(transfer())
+
+
+def report(name, payloads, received, latencies, elapsed, frames_sent, frames_good, baud):
+    delivered = sum(received.get(i) == p for i, p in enumerate(payloads))
+    goodput = sum(len(received[i]) for i in received) / elapsed
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e3 if latencies else (np.nan,) * 3
+    fer = 1.0 - frames_good / frames_sent if frames_sent else 0.0
+
+    print(f"{name}: {delivered}/{len(payloads)} delivered in {elapsed:.2f} s")
+    line = f" ({goodput / (baud / BITS_PER_BYTE):.1%} of the line)" if baud else ""
+    print(f"  goodput          : {goodput:10.0f} B/s{line}")
+    print(f"  latency p50/90/99: {p50:8.2f} {p90:8.2f} {p99:8.2f} ms")
+    print(f"  frame error rate : {fer:10.4f}  ({frames_sent - frames_good}/{frames_sent} frames)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial link benchmark over an in-memory loopback")
+    parser.add_argument("--mode", choices=("raw", "arq", "aio", "all"), default="all")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=int, default=100, help="payload bytes per frame")
+    parser.add_argument("--baud", type=int, default=115200, help="0 for an instant line")
+    parser.add_argument("--corrupt", type=float, default=0.005,
+                        help="per-byte probability of a reset to 0x00")
+    parser.add_argument("--dropout", type=float, default=0.0,
+                        help="per-byte probability of a line dropout")
+    parser.add_argument("--dropout-len", type=int, default=16, help="bytes lost per dropout")
+    parser.add_argument("--window", type=int, default=link_app.ARQ_WINDOW)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.frames, args.size, args.seed)
+
+    def new_link():
+        return LoopbackLink(("tx", "rx"), args.baud, args.corrupt,
+                            args.dropout, args.dropout_len, args.seed)
+
+    print(f"{args.frames} frames of {args.size} bytes, {args.baud} baud, "
+          f"corrupt {args.corrupt}, dropout {args.dropout} x {args.dropout_len}")
+
+    if args.mode in ("raw", "all"):
+        received, latencies, elapsed, bad = run_raw(new_link(), payloads)
+        report("raw", payloads, received, latencies, elapsed,
+               len(payloads), len(received), args.baud)
+        print(f"  damaged frames   : {bad:10d}")
+
+    for mode, run in (("arq", run_arq), ("aio", run_aio)):
+        if args.mode in (mode, "all"):
+            received, latencies, elapsed, sent, good = run(new_link(), payloads, args.window)
+            report(f"{mode} (window {args.window})", payloads, received, latencies, elapsed,
+                   sent, good, args.baud)
+
+
+if __name__ == "__main__":
+    main()
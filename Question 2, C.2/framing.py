@@ -0,0 +1,163 @@
+import binascii
+import struct
+
+# Frame layout on the wire:
+#
+#   COBS( kind (1) | seq (1) | payload (n) | CRC-16 (2, big endian) ) 0x00
+#
+# COBS removes every 0x00 from the encoded frame, so 0x00 only ever
+# appears as the delimiter: a receiver can always resync on the next
+# one, and a byte corrupted to 0x00 just splits a frame into two that
+# fail their CRC. The CRC is CRC-16/CCITT-FALSE (poly 0x1021, init
+# 0xFFFF) over kind, seq and payload.
+
+DELIMITER = b"\x00"
+CRC_INIT = 0xFFFF
+
+# frame kinds
+DATA = 0
+ACK = 1     # seq of the DATA frame received, payload: next seq expected
+NACK = 2    # seq of a DATA frame found missing, payload: seq that showed the gap
+
+_HEADER = struct.Struct(">BB")
+_CRC = struct.Struct(">H")
+OVERHEAD = _HEADER.size + _CRC.size
+
+
+class FrameError(ValueError):
+    pass
+
+
+def crc16(data, crc=CRC_INIT):
+    """CRC-16/CCITT-FALSE; crc_hqx is the same table-driven CRC, in C."""
+    return binascii.crc_hqx(data, crc)
+
+
+def cobs_encode(data):
+    out = bytearray()
+    for block in bytes(data).split(b"\x00"):
+        # blocks longer than 254 bytes go out in 254-byte pieces
+        # marked 0xFF, which carry no implied zero
+        while len(block) >= 254:
+            out.append(255)
+            out += block[:254]
+            block = block[254:]
+        out.append(len(block) + 1)
+        out += block
+    return bytes(out)
+
+
+def cobs_decode(data):
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        code = data[i]
+        if code == 0 or i + code > n:
+            raise FrameError("bad COBS code")
+        out += data[i + 1:i + code]
+        i += code
+        if code < 255 and i < n:
+            out.append(0)
+    return bytes(out)
+
+
+def encode_frame(payload, seq, kind=DATA):
+    """Payload bytes -> encoded frame, delimiter included."""
+    body = _HEADER.pack(kind, seq & 0xFF) + bytes(payload)
+    return cobs_encode(body + _CRC.pack(crc16(body))) + DELIMITER
+
+
+def decode_frame(frame):
+    """
+    Encoded frame (without the delimiter) -> (kind, seq, payload).
+    Raises FrameError if it's damaged.
+    """
+    if DELIMITER in frame:
+        raise FrameError("delimiter inside frame")
+    body = cobs_decode(frame)
+    if len(body) < OVERHEAD:
+        raise FrameError("frame too short")
+    if crc16(body[:-2]) != _CRC.unpack_from(body, len(body) - 2)[0]:
+        raise FrameError("bad CRC")
+    kind, seq = _HEADER.unpack_from(body)
+    return kind, seq, body[_HEADER.size:-2]
+
+
+class FrameReceiver:
+    def __init__(self, ser, max_frame=4096, read_size=4096):
+        """
+        Buffered frame reader for a serial-like port (read(n),
+        in_waiting).
+
+        Each fill reads everything the port has waiting in one call
+        into a buffer; frames are cut out at the delimiters. A damaged
+        frame only costs itself: decoding restarts at the next 0x00.
+
+        max_frame : longest encoded frame; bytes without a delimiter
+                    past this are dropped as line noise
+        read_size : most bytes pulled in one read
+        """
+        self.ser = ser
+        self.max_frame = max_frame
+        self.read_size = read_size
+
+        self.buf = bytearray()
+        self.start = 0      # first unconsumed byte in buf
+
+        self.good = 0
+        self.bad = 0
+        self.dropped = 0
+
+    def feed(self, data):
+        """Add received bytes."""
+        if self.start and self.start >= len(self.buf) // 2:
+            # reclaim the consumed front before growing
+            del self.buf[:self.start]
+            self.start = 0
+        self.buf += data
+
+    def _fill(self):
+        """One bulk read; False if the port timed out with nothing."""
+        waiting = self.ser.in_waiting
+        data = self.ser.read(max(1, min(waiting, self.read_size)))
+        if not data:
+            return False
+        self.feed(data)
+        return True
+
+    def frames(self):
+        """Yield every complete good frame in the buffer as (kind, seq, payload)."""
+        buf = self.buf
+        while True:
+            end = buf.find(0, self.start)
+            if end < 0:
+                if len(buf) - self.start > self.max_frame:
+                    self.dropped += len(buf) - self.start
+                    self.start = len(buf)
+                return
+
+            frame = bytes(buf[self.start:end])
+            self.start = end + 1
+            if not frame:
+                continue
+            try:
+                decoded = decode_frame(frame)
+            except FrameError:
+                self.bad += 1
+                continue
+            self.good += 1
+            yield decoded
+
+    def read_frame(self):
+        """Next good frame, or None if the port times out first."""
+        while True:
+            for frame in self.frames():
+                return frame
+            if not self._fill():
+                return None
+
+    def poll(self):
+        """All good frames that can be had from one read."""
+        self._fill()
+        return list(self.frames())
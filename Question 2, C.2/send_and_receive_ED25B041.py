@@ -1,7 +1,10 @@
+import argparse
+import asyncio
 import serial
 import numpy as np
-import threading
-import time
+import framing
+import aio_link
+import transport
 
 # Simulation of virtual serial ports
 
@@ -24,146 +27,117 @@ import time
 # Now to run your code, 
 # python3 application.py
 
+# Without virtual ports: python3 application.py --loopback
+# wires the sender and receiver ports together in memory at 9600 baud
+# (see transport.py); both still run as tasks in one event loop
+
 port_sender = 'COM30'
 port_receiver = 'COM31'
 
 BYTE_RESET_PROBABLITY = 0.005
 
-def send_data(ser: serial.Serial, data: np.ndarray) -> None:
+# frames in flight for the sliding-window ARQ (see arq.py)
+ARQ_WINDOW = 16
 
-    data_to_send = []
+def send_data(ser: serial.Serial, data: np.ndarray, seq: int = 0, corrupt_p: float = None) -> None:
 
-    # Your code to send the data
     # Input: your pwm numpy array
-    # TASK: write the data to the port_sender
-    # You are not allowed to use any functions other than ser.write() to send the data 
-    # You must send the data in bytes format, and only one byte can be sent at a time
-
-    len_data = len(data) & 0xFF
-    data_to_send.append(len_data)
-
-    for d in data:
-        data_to_send.append(int(d) & 0xFF)
-
-    checksum = sum(data_to_send[1:]) & 0xFF
-    data_to_send.append(checksum)
-
-    
-
+    # corrupt_p overrides BYTE_RESET_PROBABLITY for this frame
+    # The whole array goes out as one frame (see framing.py): COBS
+    # stuffed, 0x00 delimited, with a sequence number and a CRC-16.
+    # It is built in one buffer and written with a single ser.write()
 
+    payload = np.asarray(data).astype(np.uint8).tobytes()
+    data_to_send = np.frombuffer(framing.encode_frame(payload, seq), dtype=np.uint8).copy()
 
     # For challenge question, uncomment this
     # This should be done, JUST before sending the data
     # No other code should be there after this, other than sending the data itself
 
-    for i in range(len(data_to_send)):
-        if np.random.random() < BYTE_RESET_PROBABLITY:
-            data_to_send[i] = 0x00
-    
-    for byte in data_to_send:
-        ser.write(bytes([int(byte)& 0xFF]))
+    if corrupt_p is None:
+        corrupt_p = BYTE_RESET_PROBABLITY
+    data_to_send[np.random.random(len(data_to_send)) < corrupt_p] = 0x00
 
+    ser.write(data_to_send.tobytes())
 
-def receive_data(ser: serial.Serial) -> tuple[np.ndarray, bool]:
 
-    received_pwm_data = []
-    acknowledgement = False
+def receive_data(ser: serial.Serial, receiver: framing.FrameReceiver = None) -> tuple[np.ndarray, bool]:
 
-    # Your code to receive the data
     # Output: your PWM array, and the acknowledgement of the data transmission
-    # TASK: receive data from the port_receiver
-    # You are not allowed to use any functions other than ser.read() to receive the data
-    # You must read the data in bytes format, one by one, and convert it back to the original data format
-    # You should have a mechanism to check if the transmission of the data is properly done
-    # If yes, set the acknowledgement to True, else False
-
-    length_raw = ser.read(1)
-    if not length_raw or len(length_raw) != 1:
-        return np.array(received_pwm_data), acknowledgement
-    length= length_raw[0]
-    buffer=[]
-    while len(buffer) < length + 1:
-        byte = ser.read(1)
-        if not byte or len(byte) != 1:
-            return np.array(received_pwm_data), acknowledgement
-        buffer.append(byte[0])
-
-    payload = buffer[:length]
-    received_checksum= buffer[-1]
-    calculated_checksum = sum(payload) & 0xFF
-
-    if calculated_checksum == received_checksum:
-        received_pwm_data = np.array(payload, dtype=np.uint8)
-        acknowledgement = True
-    else:
-        received_pwm_data=np.array([], dtype=np.uint8)
-        acknowledgement = False
+    # Pulls whatever the port has in bulk and returns the next frame that
+    # decodes with a valid CRC; damaged frames are skipped up to the next
+    # delimiter. Pass the same receiver every call so bytes read past
+    # one frame are kept for the next
+
+    receiver = receiver or framing.FrameReceiver(ser)
+    frame = receiver.read_frame()
+    if frame is None:
+        return np.array([], dtype=np.uint8), False
 
-    return received_pwm_data, acknowledgement
+    kind, seq, payload = frame
+    return np.frombuffer(payload, dtype=np.uint8).copy(), kind == framing.DATA
 
-def receive_thread_task(received_data: list, no_of_success: int):
-    no_of_tries = 0
+async def receive_task(received_data: list, open_port=serial.Serial):
     try:
-        with serial.Serial(port_receiver, 9600, timeout=0.2) as ser:
-            while len(received_data) < 100 and no_of_tries < 150:
-                print(f"[RECIEVER] [{no_of_tries}] Trying to Recieve Data")
-
-                received_arr, acknowledgement = receive_data(ser)
-                
-                if np.any(received_arr) or acknowledgement:
-                    received_data.append(received_arr)
-                    if acknowledgement:
-                        print(f"[RECEIVER] [{len(received_data)}] SUCCESS")
-                        no_of_success[0] += 1
-                    else: 
-                        print(f"[RECEIVER] [{len(received_data)}] FAILED")
-                no_of_tries += 1
-                time.sleep(0.01) 
-            else: 
-                print(f"[RECEIVER] Time Out")
+        with open_port(port_receiver, 9600, timeout=0.01) as ser:
+            async with aio_link.AsyncLink(ser, corrupt_p=BYTE_RESET_PROBABLITY) as link:
+                async for payload in aio_link.arq_receive(link, 100, ARQ_WINDOW):
+                    received_data.append(np.frombuffer(payload, dtype=np.uint8).copy())
+                    print(f"[RECEIVER] [{len(received_data)}] SUCCESS")
+        if len(received_data) < 100:
+            print(f"[RECEIVER] Time Out")
     except Exception as e:
-        print(f"Receiver Thread Error: {e}")
-
-def send_thread_task(all_data):
-    try: 
-        with serial.Serial(port_sender, 9600) as ser:
-            for i, data in enumerate(all_data):
-                send_data(ser, data)
-                print(f"[SENDER]   [{i+1}] Packet Sent")
-                time.sleep(0.15) 
+        print(f"Receiver Error: {e}")
+
+async def send_task(all_data, open_port=serial.Serial):
+    try:
+        with open_port(port_sender, 9600, timeout=0.01) as ser:
+            async with aio_link.AsyncLink(ser, corrupt_p=BYTE_RESET_PROBABLITY) as link:
+                payloads = [np.asarray(data).astype(np.uint8).tobytes() for data in all_data]
+                sender = await aio_link.arq_send(link, payloads, ARQ_WINDOW,
+                                                 on_ack=lambda i: print(f"[SENDER]   [{i+1}] Packet Acknowledged"))
+                print(f"[SENDER]   {sender.sent} frames sent, {sender.retransmitted} retransmissions")
     except Exception as e:
-        print(f"Sender Thread Error: {e}")
+        print(f"Sender Error: {e}")
 
 def generate_pwm():
 
     pwm = np.random.randint(0, 255, size=(100,))
     return pwm
 
-def main():
+async def run(pwm_data, open_port=serial.Serial):
+
+    # Sender and receiver share one event loop: no threads, no fixed
+    # sleeps, each side wakes when its port has data or a timer is due
 
-    pwm_data = [generate_pwm() for i in range(100)]
     received_data = []
-    no_of_success = [0]
+    try:
+        await asyncio.wait_for(asyncio.gather(receive_task(received_data, open_port),
+                                              send_task(pwm_data, open_port)), timeout=60)
+    except asyncio.TimeoutError:
+        print("Time Out")
+    return received_data
 
-    receiver_thread = threading.Thread(target=receive_thread_task, args=(received_data, no_of_success))
-    receiver_thread.daemon = True
-    receiver_thread.start()
+def main(open_port=serial.Serial):
 
-    time.sleep(1)
+    # open_port: port factory called like serial.Serial (see transport.py)
 
-    sender_thread = threading.Thread(target=send_thread_task, args=(pwm_data,))
-    sender_thread.daemon = True
-    sender_thread.start()
+    pwm_data = [generate_pwm() for i in range(100)]
+    received_data = asyncio.run(run(pwm_data, open_port))
 
-    time.sleep(1)
+    print(f"Total Successful: {len(received_data)}/100")
 
-    sender_thread.join(timeout=30)
-    receiver_thread.join(timeout=30)
+if __name__ == "__main__":
 
-    print(f"Total Successful: {no_of_success[0]}/100")
+    parser = argparse.ArgumentParser(description="Send PWM arrays over a noisy serial link")
+    parser.add_argument("--loopback", action="store_true",
+                        help="in-memory link at 9600 baud instead of the virtual ports")
+    args = parser.parse_args()
 
-if __name__ == "__main__":
-    main()
+    if args.loopback:
+        main(transport.LoopbackLink((port_sender, port_receiver)).open)
+    else:
+        main()
 
     
 
@@ -0,0 +1,204 @@
+import threading
+import time
+import numpy as np
+
+# What the link code (framing.FrameReceiver, arq, send_data/receive_data)
+# needs from a port, so anything with these can stand in for a
+# serial.Serial:
+#
+#   read(n)      up to n bytes; waits until n have arrived or `timeout`
+#                seconds pass (None: wait forever, 0: don't wait)
+#   write(data)  queue bytes for sending, returns the count
+#   in_waiting   bytes received and not yet read
+#   timeout      read timeout, settable
+#
+# A port factory is anything called like serial.Serial(port, baudrate,
+# timeout=...) that returns such a port, usable in a with block.
+#
+# LoopbackLink connects two such ports in memory: what one writes the
+# other reads, at the speed of the line and through a noise model.
+
+BITS_PER_BYTE = 10      # 8N1: start bit, 8 data bits, stop bit
+
+
+class _Channel:
+    def __init__(self, rng):
+        """One direction of a LoopbackLink."""
+        self.cond = threading.Condition()
+        self.rng = rng
+        self.buf = bytearray()          # arrived, not yet read
+        self.chunks = []                # in flight: (data, arrival time of each byte)
+        self.line_free = 0.0            # when the wire finishes what's queued
+        self.closed = False
+
+    def _advance(self, now):
+        """Move bytes whose arrival time has passed into buf."""
+        while self.chunks:
+            data, times = self.chunks[0]
+            k = int(np.searchsorted(times, now, side="right"))
+            self.buf += data[:k]
+            if k < len(data):
+                self.chunks[0] = (data[k:], times[k:])
+                return times[k]         # next arrival
+            self.chunks.pop(0)
+        return None
+
+    def send(self, data, byte_time, corrupt_p, dropout_p, dropout_len):
+        n = len(data)
+        if not n:
+            return
+        data = np.frombuffer(bytes(data), dtype=np.uint8).copy()
+        with self.cond:
+            if self.closed:
+                return
+            now = time.monotonic()
+            start = max(now, self.line_free)
+            times = start + byte_time * np.arange(1, n + 1)
+            self.line_free = times[-1]
+
+            if corrupt_p > 0:
+                data[self.rng.random(n) < corrupt_p] = 0x00
+            if dropout_p > 0:
+                # each dropout loses dropout_len bytes; they still take
+                # their time on the wire
+                starts = np.flatnonzero(self.rng.random(n) < dropout_p)
+                if len(starts):
+                    edges = np.zeros(n + 1, dtype=np.int64)
+                    np.add.at(edges, starts, 1)
+                    np.add.at(edges, np.minimum(starts + dropout_len, n), -1)
+                    keep = np.cumsum(edges[:n]) == 0
+                    data, times = data[keep], times[keep]
+
+            if len(data):
+                self.chunks.append((data.tobytes(), times))
+            self.cond.notify_all()
+
+    def in_waiting(self):
+        with self.cond:
+            self._advance(time.monotonic())
+            return len(self.buf)
+
+    def recv(self, n, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                next_at = self._advance(now)
+                if len(self.buf) >= n:
+                    break
+                if deadline is not None and now >= deadline:
+                    break
+                # sleep until the next byte lands, the deadline, or a write
+                wait = [t - now for t in (next_at, deadline) if t is not None]
+                self.cond.wait(min(wait) if wait else None)
+            data = bytes(self.buf[:n])
+            del self.buf[:n]
+            return data
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class LoopbackPort:
+    def __init__(self, link, name, rx, tx, baudrate, timeout):
+        """One end of a LoopbackLink; get it from LoopbackLink.open()."""
+        self.link = link
+        self.name = name
+        self._rx = rx
+        self._tx = tx
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.is_open = True
+
+    @property
+    def byte_time(self):
+        """Seconds one byte takes on the wire (0 for an unlimited line)."""
+        baudrate = self.baudrate if self.link.baudrate is None else self.link.baudrate
+        return BITS_PER_BYTE / baudrate if baudrate else 0.0
+
+    @property
+    def in_waiting(self):
+        return self._rx.in_waiting()
+
+    @property
+    def out_waiting(self):
+        """Bytes written that are still going out on the wire."""
+        byte_time = self.byte_time
+        if not byte_time:
+            return 0
+        return max(0, round((self._tx.line_free - time.monotonic()) / byte_time))
+
+    def read(self, n=1):
+        if not self.is_open:
+            raise ValueError("port is closed")
+        return self._rx.recv(n, self.timeout)
+
+    def write(self, data):
+        if not self.is_open:
+            raise ValueError("port is closed")
+        link = self.link
+        self._tx.send(data, self.byte_time, link.corrupt_p, link.dropout_p, link.dropout_len)
+        return len(data)
+
+    def flush(self):
+        """Wait until everything written has gone out on the wire."""
+        wait = self._tx.line_free - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def reset_input_buffer(self):
+        with self._rx.cond:
+            self._rx._advance(time.monotonic())
+            self._rx.buf.clear()
+
+    def close(self):
+        # like unplugging a serial cable: what's in flight still
+        # arrives, then the other end's reads just time out
+        self.is_open = False
+        self._tx.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LoopbackLink:
+    def __init__(self, names=("loop0", "loop1"), baudrate=None, corrupt_p=0.0,
+                 dropout_p=0.0, dropout_len=16, seed=None):
+        """
+        Two serial ports wired together in memory, for running and
+        benchmarking the link without hardware or virtual COM ports.
+
+        Bytes take BITS_PER_BYTE / baudrate seconds each on the wire and
+        queue behind each other like on a real line; the reader wakes as
+        they land. Both directions get the same, independently drawn, noise:
+
+        names       : port names accepted by open()
+        baudrate    : line rate; None uses the one each port is opened
+                      with, 0 makes the line instant
+        corrupt_p   : per-byte probability of a reset to 0x00 (the
+                      BYTE_RESET_PROBABLITY model)
+        dropout_p   : per-byte probability that the line drops out,
+                      losing dropout_len bytes
+        seed        : for the noise
+        """
+        self.names = tuple(names)
+        self.baudrate = baudrate
+        self.corrupt_p = corrupt_p
+        self.dropout_p = dropout_p
+        self.dropout_len = dropout_len
+        rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(2)]
+        self._channels = (_Channel(rngs[0]), _Channel(rngs[1]))
+
+    def open(self, port, baudrate=9600, timeout=None):
+        """Port factory with serial.Serial's signature."""
+        if port not in self.names:
+            raise ValueError(f"no loopback port {port!r}, have {self.names}")
+        end = self.names.index(port)
+        # end 0 sends on channel 0 and reads channel 1, end 1 the reverse
+        rx, tx = self._channels[1 - end], self._channels[end]
+        return LoopbackPort(self, port, rx, tx, baudrate, timeout)
@@ -0,0 +1,111 @@
+############################
+# Asynchronous multi-rate fusion: per-sensor CSV streams are merged
+# by timestamp and fed to the KalmanFilter one measurement at a time,
+# predicting with the real elapsed time in between
+############################
+
+import csv
+import heapq
+import os
+from math import sqrt
+from kalman_filter import KalmanFilter
+
+
+# which rows of the KalmanFilter measurement vector each sensor fills
+SENSOR_ROWS = {
+    "sensor1": (0, 1),
+    "sensor2": (2, 3),
+}
+
+
+def stream_csv(path, sensor):
+    """
+    Yield (timestamp, sensor, x, y) for every row of a
+    timestamp,position_x,position_y,... CSV, reading lazily.
+    """
+    with open(path, "r") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            yield float(row[0]), sensor, float(row[1]), float(row[2])
+
+
+def merge_streams(streams):
+    """
+    k-way merge of timestamp-ordered event streams (heap based,
+    holds one pending event per stream).
+    """
+    return heapq.merge(*streams, key=lambda event: event[0])
+
+
+def fuse(events, kf=None, sensor_rows=SENSOR_ROWS):
+    """
+    Run the filter over timestamp-ordered (t, sensor, x, y) events.
+
+    Predicts with the time elapsed since the previous event and
+    updates with only the sensor that reported. Events sharing a
+    timestamp are applied back to back without a predict.
+
+    Yields (t, x, y) filtered positions, one per event.
+    """
+    if kf is None:
+        kf = KalmanFilter()
+
+    t_prev = None
+    for t, sensor, x, y in events:
+        if t_prev is not None and t > t_prev:
+            kf.predict(t - t_prev)
+        t_prev = t
+
+        z = [float("nan")] * 4
+        row_x, row_y = sensor_rows[sensor]
+        z[row_x] = x
+        z[row_y] = y
+        kf.update_sequential(z)
+
+        yield t, kf.x_hat[0, 0], kf.x_hat[1, 0]
+
+
+def last_per_timestamp(estimates):
+    """
+    Collapse runs of (t, x, y) estimates sharing a timestamp (rounded
+    to 1 us) to the last of each, holding only the current one.
+    """
+    pending = None
+    for t, x, y in estimates:
+        t = round(t, 6)
+        if pending is not None and pending[0] != t:
+            yield pending
+        pending = (t, x, y)
+    if pending is not None:
+        yield pending
+
+
+def main():
+    data_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+    events = merge_streams([
+        stream_csv(os.path.join(data_folder, "sensor1_noisy.csv"), "sensor1"),
+        stream_csv(os.path.join(data_folder, "sensor2_noisy.csv"), "sensor2"),
+    ])
+    estimates = last_per_timestamp(fuse(events))
+
+    # both streams are in timestamp order: walk them together,
+    # comparing the latest estimate at each ground-truth timestamp
+    total = 0.0
+    count = 0
+    estimate = next(estimates, None)
+    for t, _, x, y in stream_csv(os.path.join(data_folder, "odom.csv"), "truth"):
+        t = round(t, 6)
+        while estimate is not None and estimate[0] < t:
+            estimate = next(estimates, None)
+        if estimate is not None and estimate[0] == t:
+            total += (estimate[1] - x) ** 2 + (estimate[2] - y) ** 2
+            count += 2
+
+    if count:
+        print(f"Root Square Mean Error: {sqrt(total / count)}")
+
+
+if __name__ == "__main__":
+    main()
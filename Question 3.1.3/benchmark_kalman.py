@@ -0,0 +1,204 @@
+############################
+# Kalman filter benchmark and accuracy regression suite
+#
+# Runs every filter variant over a synthetic trajectory, reports
+# throughput and RMSE against ground truth, and compares them with
+# a stored baseline:
+#
+#   python benchmark_kalman.py                   # run + check baseline
+#   python benchmark_kalman.py --save-baseline   # record a new baseline
+#
+# Exits with status 1 if a variant is slower or less accurate than
+# the baseline allows. Speed is compared relative to the plain `loop`
+# variant of the same run, so a baseline recorded on one machine still
+# holds on a faster or slower one; RMSE is deterministic and compared
+# as is.
+############################
+
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from kalman_filter import KalmanFilter, KalmanFilterBank
+
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"
+)
+
+
+def synthetic_measurements(n, dt=0.1, seed=0):
+    """
+    Constant-velocity-ish trajectory with random accelerations,
+    observed by two position sensors with the filter's R noise.
+
+    Returns (truth (n, 2), Z (n, 4)).
+    """
+    rng = np.random.default_rng(seed)
+    acc = rng.normal(0.0, 0.5, (n, 2))
+    vel = 1.0 + np.cumsum(acc * dt, axis=0)
+    pos = 5.0 + np.cumsum(vel * dt, axis=0)
+
+    std = np.sqrt(np.diag(KalmanFilter(dt).R))
+    Z = np.hstack((pos, pos)) + rng.normal(0.0, 1.0, (n, 4)) * std
+    return pos, Z
+
+
+########################## VARIANTS ##########################
+# Each takes Z (N, 4) and returns filtered positions (N', 2)
+
+def run_loop(Z, steady_state=False, sequential=False):
+    kf = KalmanFilter(steady_state=steady_state)
+    update = kf.update_sequential if sequential else kf.update
+    out = np.empty((len(Z), 2))
+    for i, z in enumerate(Z):
+        kf.predict()
+        update(z.reshape(4, 1))
+        out[i] = kf.x_hat[:2, 0]
+    return out
+
+
+def run_batch(Z):
+    return KalmanFilter().filter_batch(Z)[0][:, :2]
+
+
+def run_smooth(Z):
+    return KalmanFilter().smooth_batch(Z)[0][:, :2]
+
+
+def run_bank(Z, tracks=100):
+    """
+    The trajectory cut into `tracks` equal segments, filtered as
+    independent tracks of one KalmanFilterBank.
+    """
+    steps = len(Z) // tracks
+    Z_tracks = Z[:steps * tracks].reshape(tracks, steps, 4)
+    bank = KalmanFilterBank(tracks)
+    out = np.empty((tracks, steps, 2))
+    for k in range(steps):
+        bank.predict()
+        bank.update(Z_tracks[:, k])
+        out[:, k] = bank.x_hat[:, :2, 0]
+    return out.reshape(-1, 2)
+
+
+REFERENCE = "loop"     # speeds are checked relative to this variant
+
+VARIANTS = {
+    "loop": run_loop,
+    "loop_steady": lambda Z: run_loop(Z, steady_state=True),
+    "loop_sequential": lambda Z: run_loop(Z, sequential=True),
+    "filter_batch": run_batch,
+    "smooth_batch": run_smooth,
+    "bank": run_bank,
+}
+
+
+########################## SUITE ##########################
+
+def measure(rows, seed=0, repeat=3):
+    """Best-of-`repeat` throughput and RMSE of every variant."""
+    truth, Z = synthetic_measurements(rows, seed=seed)
+
+    results = {}
+    for name, fn in VARIANTS.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            estimate = fn(Z)
+            best = min(best, time.perf_counter() - start)
+
+        n = len(estimate)
+        results[name] = {
+            "rows_per_sec": n / best,
+            "us_per_sample": best / n * 1e6,
+            "rmse": float(np.sqrt(np.mean((estimate - truth[:n]) ** 2))),
+        }
+
+    reference = results[REFERENCE]["rows_per_sec"]
+    for res in results.values():
+        res["relative_speed"] = res["rows_per_sec"] / reference
+    return results
+
+
+def check(results, baseline, speed_tol, rmse_tol):
+    """Regression messages for results against a baseline (empty if none)."""
+    failures = []
+    for name, base in baseline["variants"].items():
+        if name not in results:
+            failures.append(f"{name}: missing from this run")
+            continue
+        res = results[name]
+
+        min_speed = base["relative_speed"] * (1.0 - speed_tol)
+        if name != REFERENCE and res["relative_speed"] < min_speed:
+            failures.append(
+                f"{name}: {res['relative_speed']:.2f}x {REFERENCE}, "
+                f"below {min_speed:.2f}x (baseline {base['relative_speed']:.2f}x)"
+            )
+
+        max_rmse = base["rmse"] * (1.0 + rmse_tol)
+        if res["rmse"] > max_rmse:
+            failures.append(
+                f"{name}: RMSE {res['rmse']:.5f}, "
+                f"above {max_rmse:.5f} (baseline {base['rmse']:.5f})"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kalman filter benchmark suite")
+    parser.add_argument("--rows", type=int, default=20000,
+                        help="length of the synthetic trajectory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per variant, the fastest one counts")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    parser.add_argument("--speed-tol", type=float, default=0.5,
+                        help=f"allowed fractional drop in throughput relative to {REFERENCE}")
+    parser.add_argument("--rmse-tol", type=float, default=0.01,
+                        help="allowed fractional increase in RMSE")
+    args = parser.parse_args()
+
+    results = measure(args.rows, args.seed, args.repeat)
+
+    print(f"rows: {args.rows}  seed: {args.seed}")
+    for name, res in results.items():
+        print(f"{name:16s}: {res['rows_per_sec']:12.0f} rows/sec "
+              f"{res['us_per_sample']:9.3f} us/sample {res['relative_speed']:7.2f}x "
+              f"RMSE {res['rmse']:.5f}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"rows": args.rows, "seed": args.seed, "variants": results},
+                      f, indent=2)
+            f.write("\n")
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("no baseline yet, run with --save-baseline to record one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    if (baseline["rows"], baseline["seed"]) != (args.rows, args.seed):
+        print(f"baseline was recorded with --rows {baseline['rows']} "
+              f"--seed {baseline['seed']}, rerun with those to compare")
+        sys.exit(1)
+
+    failures = check(results, baseline, args.speed_tol, args.rmse_tol)
+    for failure in failures:
+        print("REGRESSION", failure)
+    if failures:
+        sys.exit(1)
+    print("no regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
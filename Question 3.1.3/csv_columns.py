@@ -0,0 +1,83 @@
+############################
+# Columnar CSV loader: numeric CSV files with a header row are read
+# straight into NumPy columns, with an optional .npy cache
+#
+# Mirrored verbatim (below this header) in Question 6's
+# utils/csv_columns.py: the two projects run standalone, so each keeps
+# its own copy. tests/test_csv_columns.py in each project checks the
+# other copy still matches. Change both together.
+############################
+
+import hashlib
+import os
+import warnings
+import numpy as np
+
+
+def _header(path):
+    with open(path, "r") as f:
+        return [name.strip() for name in f.readline().split(",")]
+
+
+def cache_path(path, cache_dir):
+    """Where load_columns caches path's table inside cache_dir."""
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{key}.npy")
+
+
+def load_columns(path, cache_dir=None):
+    """
+    Read a numeric CSV (one header row) into a dict of
+    column name -> 1-D float array.
+
+    With a cache_dir the parsed table is also saved there (see
+    cache_path), stamped with the CSV's mtime. Later loads of an
+    unchanged file memory-map that copy instead of parsing text, so
+    only the columns actually touched are read from disk. Without
+    one nothing is written, and the CSV's own folder never is.
+
+    Columns are always read-only ndarrays, cached or not; copy one
+    before modifying it. A header-only file gives empty columns.
+    """
+    names = _header(path)
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = None if cache_dir is None else cache_path(path, cache_dir)
+
+    if cached and os.path.exists(cached) and os.stat(cached).st_mtime_ns == mtime_ns:
+        table = np.load(cached, mmap_mode="r")
+        if list(table.dtype.names) == names:
+            return _columns(table, names)
+
+    with warnings.catch_warnings():
+        # a header-only log is just empty, not worth a warning
+        warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+        values = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2, dtype=float)
+    if values.size == 0:
+        values = np.empty((0, len(names)))
+    table = np.empty(len(values), dtype=[(name, float) for name in names])
+    for i, name in enumerate(names):
+        table[name] = values[:, i]
+
+    if cached:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cached}.{os.getpid()}.tmp.npy"
+            np.save(tmp, table)
+            os.replace(tmp, cached)
+            os.utime(cached, ns=(mtime_ns, mtime_ns))
+        except OSError:
+            # unwritable cache_dir: just skip the cache
+            pass
+
+    return _columns(table, names)
+
+
+def _columns(table, names):
+    """Read-only plain-ndarray views of a table's columns."""
+    columns = {}
+    for name in names:
+        # asarray drops the memmap subclass but keeps the lazy view
+        column = np.asarray(table[name])
+        column.flags.writeable = False
+        columns[name] = column
+    return columns
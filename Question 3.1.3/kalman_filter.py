@@ -8,12 +8,18 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-import csv
 import os
 from math import sqrt
+from csv_columns import load_columns
 
 class KalmanFilter:
-    def __init__(self, dt=0.1):
+    def __init__(self, dt=0.1, steady_state=False):
+        # steady_state: use the converged gain of the discrete Riccati
+        # equation instead of propagating P every step (see steady_gain)
+        self.steady_state = steady_state
+        self.K_ss = None
+        self.dt = dt
+
         # State vector 
         self.x_hat = np.zeros((4, 1))
     
@@ -37,12 +43,20 @@ class KalmanFilter:
 
 
     # Go through the kalman filter algorithm and translate it to code
-    def predict(self):
-        self.x_hat = self.F @ self.x_hat
-        self.P = self.F @ self.P @ self.F.T + self.Q
+    def predict(self, dt=None):
+        # dt: elapsed time if it differs from the nominal step
+        F = self.F if dt is None else self.transition(dt)
+        self.x_hat = F @ self.x_hat
+        if self.steady_state:
+            return
+        Q = self.Q if dt is None else self.Q * (dt / self.dt)
+        self.P = F @ self.P @ F.T + Q
 
 
     def update(self, z):
+        if self.steady_state:
+            self.x_hat = self.x_hat + self.steady_gain() @ (z - self.H @ self.x_hat)
+            return
         innovation = z - self.H @ self.x_hat
         S = self.H @ self.P @ self.H.T + self.R
         K = self.P @ self.H.T @ np.linalg.inv(S)
@@ -51,20 +65,355 @@ class KalmanFilter:
 
     ################ YOUR CODE ENDS HERE ####################
 
+    @staticmethod
+    def transition(dt):
+        """Constant-velocity F for an arbitrary time step."""
+        return np.array([[1, 0, dt, 0],
+                         [0, 1, 0, dt],
+                         [0, 0, 1, 0],
+                         [0, 0, 0, 1]])
+
+    def update_sequential(self, z):
+        """
+        Same result as update(), without the 4x4 inverse; valid
+        because R is diagonal (independent measurement rows).
+
+        Rows observing the same state combination (both sensors see
+        x and y) are first fused in information form: weights 1/r
+        add up and z becomes the weighted mean. Each fused row is
+        then a scalar update with the Joseph form covariance step,
+        P = (I - k h^T) P (I - k h^T)^T + k r k^T, which keeps P
+        positive semi-definite over long runs. At 4x4, plain Python
+        floats are cheaper than NumPy call overhead.
+
+        Rows of z that are NaN are skipped, so a tick where only
+        one sensor reported passes e.g. [x1, y1, nan, nan].
+
+        In steady_state mode P is not tracked: the steady-state gain
+        is applied to the rows present, as update() does. With rows
+        missing that is an approximation, since the gain assumes
+        every sensor reports each step.
+        """
+        if self.steady_state:
+            z = np.asarray(z, dtype=float).reshape(4, 1)
+            present = ~np.isnan(z[:, 0])
+            innovation = z[present] - self.H[present] @ self.x_hat
+            self.x_hat = self.x_hat + self.steady_gain()[:, present] @ innovation
+            return
+
+        z = np.asarray(z, dtype=float).reshape(-1).tolist()
+        r = np.diag(self.R).tolist()
+
+        # information-form fusion of rows with identical h
+        fused = {}
+        for z_i, r_i, h in zip(z, r, self.H.tolist()):
+            if z_i != z_i:
+                # NaN: this sensor did not report
+                continue
+            info = fused.setdefault(tuple(h), [0.0, 0.0])
+            info[0] += 1.0 / r_i
+            info[1] += z_i / r_i
+
+        x = self.x_hat[:, 0].tolist()
+        P = self.P.tolist()
+
+        for h, (w, wz) in fused.items():
+            if h.count(0) == len(h) - 1 and max(h) == 1:
+                j = h.index(1)
+                Ph = [row[j] for row in P]
+                hx = x[j]
+                hPh = Ph[j]
+            else:
+                Ph = [sum(p * v for p, v in zip(row, h)) for row in P]
+                hx = sum(a * v for a, v in zip(x, h))
+                hPh = sum(a * v for a, v in zip(Ph, h))
+
+            s = hPh + 1.0 / w
+            k = [Ph_r / s for Ph_r in Ph]
+            innovation = wz / w - hx
+
+            x = [x_r + k_r * innovation for x_r, k_r in zip(x, k)]
+
+            # Joseph form multiplied out (P symmetric, so h^T P = Ph^T):
+            # P - k Ph^T - Ph k^T + k (h^T P h + r) k^T, with s = h^T P h + r
+            # Unlike P - (Ph)(Ph)^T / s it is valid for any k, so gain
+            # rounding can't push P towards indefinite.
+            P = [
+                [P_rc - k_r * Ph_c - Ph_r * k_c + k_r * s * k_c
+                 for P_rc, Ph_c, k_c in zip(row, Ph, k)]
+                for row, Ph_r, k_r in zip(P, Ph, k)
+            ]
+
+        self.x_hat = np.array(x).reshape(4, 1)
+        self.P = np.array(P)
+
+    def solve_riccati(self, tol=1e-12, max_iter=100000):
+        """
+        Iterate the discrete Riccati recursion from the current P
+        until the predicted covariance stops changing.
+
+        Returns the steady-state (P_pred, K, P_filt).
+        """
+        I = np.eye(4)
+        P_pred = self.F @ self.P @ self.F.T + self.Q
+        for _ in range(max_iter):
+            S = self.H @ P_pred @ self.H.T + self.R
+            K = np.linalg.solve(S, self.H @ P_pred).T
+            P_filt = (I - K @ self.H) @ P_pred
+            P_next = self.F @ P_filt @ self.F.T + self.Q
+            if np.abs(P_next - P_pred).max() < tol:
+                return P_next, K, P_filt
+            P_pred = P_next
+
+        raise RuntimeError("Riccati iteration did not converge")
+
+    def steady_gain(self):
+        """
+        Steady-state Kalman gain, solved once and cached.
+
+        In steady_state mode P is fixed at the steady-state filtered
+        covariance and each step costs two small mat-vec products.
+        """
+        if self.K_ss is None:
+            _, self.K_ss, P_filt = self.solve_riccati()
+            if self.steady_state:
+                self.P = P_filt
+        return self.K_ss
+
+    def _batch_covariances(self, n, tol=1e-12):
+        """
+        Predicted/filtered covariances and gains for n steps.
+
+        With constant F, H, Q and R these do not depend on the
+        measurements. Once P stops changing the remaining steps
+        reuse the converged values instead of iterating.
+
+        Also returns the number of steps before convergence
+        (n if P never converged).
+        """
+        I = np.eye(4)
+        P_pred = np.empty((n, 4, 4))
+        P_filt = np.empty((n, 4, 4))
+        K = np.empty((n, 4, 4))
+
+        if self.steady_state:
+            K[:] = self.steady_gain()
+            P_filt[:] = self.P
+            P_pred[:] = self.F @ self.P @ self.F.T + self.Q
+            return P_pred, P_filt, K, 0
+
+        P = self.P
+        n_transient = n
+        for k in range(n):
+            P_pred[k] = self.F @ P @ self.F.T + self.Q
+            S = self.H @ P_pred[k] @ self.H.T + self.R
+            K[k] = np.linalg.solve(S, self.H @ P_pred[k]).T
+            P_filt[k] = (I - K[k] @ self.H) @ P_pred[k]
+
+            if k > 0 and np.abs(P_filt[k] - P).max() < tol:
+                P_pred[k + 1:] = P_pred[k]
+                P_filt[k + 1:] = P_filt[k]
+                K[k + 1:] = K[k]
+                n_transient = k + 1
+                break
+            P = P_filt[k]
+
+        return P_pred, P_filt, K, n_transient
+
+    @staticmethod
+    def _linear_recurrence(A, B, x0, block=32):
+        """
+        x_k = A x_{k-1} + B_k for all rows of B (N, 4), vectorized.
+
+        Within a block of L steps the response to B is a fixed
+        (4L x 4L) lower block-triangular matrix of powers of A, so
+        all blocks are solved with one matmul; only the carried
+        state is propagated block to block.
+        """
+        n = len(B)
+        L = min(block, max(n, 1))
+        n_blocks = -(-n // L)
+
+        powers = np.empty((L + 1, 4, 4))
+        powers[0] = np.eye(4)
+        for i in range(1, L + 1):
+            powers[i] = A @ powers[i - 1]
+
+        M = np.zeros((L, 4, L, 4))
+        for i in range(L):
+            for j in range(i + 1):
+                M[i, :, j, :] = powers[i - j]
+        M = M.reshape(4 * L, 4 * L)
+
+        B_pad = np.zeros((n_blocks * L, 4))
+        B_pad[:n] = B
+        Y = B_pad.reshape(n_blocks, 4 * L) @ M.T
+
+        # state entering each block
+        starts = np.empty((n_blocks, 4))
+        x = x0
+        for b in range(n_blocks):
+            starts[b] = x
+            x = powers[L] @ x + Y[b, -4:]
+
+        X = Y + starts @ powers[1:].reshape(4 * L, 4).T
+        return X.reshape(-1, 4)[:n]
+
+    def filter_batch(self, Z, return_predicted=False):
+        """
+        Run predict + update over a whole (N, 4) measurement array.
+
+        Equivalent to calling predict() and update() once per row,
+        starting from the current state; the filter is left in the
+        final state.
+
+        Returns (x (N, 4), P (N, 4, 4)) filtered states and
+        covariances, plus the predicted ones if return_predicted.
+        """
+        Z = np.asarray(Z, dtype=float)
+        n = len(Z)
+        P_pred, P_filt, K, n_transient = self._batch_covariances(n)
+
+        x_filt = np.empty((n, 4))
+        F = self.F
+        H = self.H
+        x = self.x_hat[:, 0]
+        for k in range(n_transient):
+            x_pred_k = F @ x
+            x = x_pred_k + K[k] @ (Z[k] - H @ x_pred_k)
+            x_filt[k] = x
+
+        if n_transient < n:
+            # constant gain: x_k = (I - K H) F x_{k-1} + K z_k
+            K_ss = K[n_transient]
+            A = (np.eye(4) - K_ss @ H) @ F
+            x_filt[n_transient:] = self._linear_recurrence(
+                A, Z[n_transient:] @ K_ss.T, x
+            )
+
+        x_pred = np.empty((n, 4))
+        if n:
+            x_pred[0] = F @ self.x_hat[:, 0]
+            x_pred[1:] = x_filt[:-1] @ F.T
+
+            self.x_hat = x_filt[-1].reshape(4, 1)
+            self.P = P_filt[-1].copy()
+
+        if return_predicted:
+            return x_filt, P_filt, x_pred, P_pred
+        return x_filt, P_filt
+
+    def smooth_batch(self, Z):
+        """
+        Filter a whole (N, 4) measurement array, then run a
+        Rauch-Tung-Striebel backward pass.
+
+        Returns smoothed (x (N, 4), P (N, 4, 4)).
+        """
+        x_filt, P_filt, x_pred, P_pred = self.filter_batch(Z, return_predicted=True)
+        n = len(x_filt)
+        if n < 2:
+            return x_filt, P_filt
+
+        # from `steady` on the filter ran at steady state, so the
+        # smoother gain is constant there
+        same = (
+            (P_filt[:-1] == P_filt[-1]).all(axis=(1, 2)) &
+            (P_pred[1:] == P_pred[-1]).all(axis=(1, 2))
+        )
+        changing = np.flatnonzero(~same)
+        steady = changing[-1] + 1 if len(changing) else 0
+
+        # smoother gains C_k = P_k F^T P_pred_{k+1}^-1, all at once
+        m = min(steady + 1, n - 1)
+        C = np.empty((n - 1, 4, 4))
+        C[:m] = np.linalg.solve(P_pred[1:m + 1], self.F @ P_filt[:m]).transpose(0, 2, 1)
+        C[m:] = C[m - 1]
+
+        x_smooth = x_filt.copy()
+        P_smooth = P_filt.copy()
+
+        if steady < n - 1:
+            # x_k = C x_{k+1} + (x_filt_k - C x_pred_{k+1}), run backwards
+            C_ss = C[-1]
+            B = x_filt[steady:-1] - x_pred[steady + 1:] @ C_ss.T
+            x_smooth[steady:-1] = self._linear_recurrence(
+                C_ss, B[::-1], x_smooth[-1]
+            )[::-1]
+
+        k = n - 2
+        while k >= 0:
+            if k < steady:
+                x_smooth[k] += C[k] @ (x_smooth[k + 1] - x_pred[k + 1])
+            P_smooth[k] += C[k] @ (P_smooth[k + 1] - P_pred[k + 1]) @ C[k].T
+
+            if k > steady and np.abs(P_smooth[k] - P_smooth[k + 1]).max() < 1e-12:
+                # smoothed covariance has converged too
+                P_smooth[steady:k] = P_smooth[k]
+                k = steady
+            k -= 1
+
+        return x_smooth, P_smooth
+
+
+class KalmanFilterBank:
+    def __init__(self, n_tracks, dt=0.1):
+        """
+        n_tracks independent KalmanFilters (same model) stepped
+        together: x_hat is (M, 4, 1) and P is (M, 4, 4).
+        """
+        model = KalmanFilter(dt)
+        self.F = model.F
+        self.H = model.H
+        self.Q = model.Q
+        self.R = model.R
+
+        self.x_hat = np.zeros((n_tracks, 4, 1))
+        self.P = np.repeat(model.P[None], n_tracks, axis=0)
+
+    def predict(self):
+        self.x_hat = self.F @ self.x_hat
+        self.P = self.F @ self.P @ self.F.T + self.Q
+
+    def update(self, z, mask=None):
+        """
+        z    : (M, 4) or (M, 4, 1) measurements
+        mask : None (all present), (M,) per track or (M, 4) per
+               measurement row; False entries are treated as
+               missing and may hold anything (e.g. NaN)
+
+        Missing rows get a zero row in H, so (with diagonal R) their
+        gain columns are zero and they do not affect the track.
+        """
+        z = np.asarray(z, dtype=float).reshape(len(self.x_hat), 4, 1)
+
+        if mask is None:
+            H = self.H
+        else:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.ndim == 1:
+                mask = np.repeat(mask[:, None], 4, axis=1)
+            mask = mask[:, :, None]
+            H = self.H * mask
+            z = np.where(mask, z, 0.0)
+
+        H_T = np.swapaxes(H, -1, -2)
+        innovation = z - H @ self.x_hat
+        S = H @ self.P @ H_T + self.R
+        K = np.swapaxes(np.linalg.solve(S, H @ self.P), -1, -2)
+        self.x_hat = self.x_hat + K @ innovation
+        self.P = (np.eye(4) - K @ H) @ self.P
+
 
 ########################## VISUALIZATION ##########################
+def extract_odom_array(odom_csv_file):
+    """(N, 2) array of position_x, position_y, via the columnar loader."""
+    columns = load_columns(odom_csv_file)
+    return np.column_stack((columns["position_x"], columns["position_y"]))
+
+
 def extract_odom_from_csv(odom_csv_file):
-    odom_data = []
-    with open(odom_csv_file, "r") as f:
-        reader = csv.reader(f)
-        next(reader)
-        for row in reader:
-            odom_x = float(row[1])
-            odom_y = float(row[2])
-            odom = (odom_x, odom_y)
-            odom_data.append(odom)
-        
-    return odom_data
+    return list(map(tuple, extract_odom_array(odom_csv_file).tolist()))
     
 
 def setup_plot(ax, data, title, color):
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from csv_columns import load_columns  # noqa: E402
+
+# the other project's copy of the loader (see the module header)
+MIRROR = os.path.join(ROOT, "..", "Question 6", "Autonomous-Rover-Simulation-clean-main", "utils", "csv_columns.py")
+
+
+def _code(filename):
+    """Module source below its leading comment header."""
+    with open(filename) as f:
+        lines = f.read().splitlines()
+    while lines and (lines[0].startswith("#") or not lines[0].strip()):
+        lines.pop(0)
+    return lines
+
+
+def test_header_only_csv_gives_empty_columns(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("x,y\n")
+    for _ in range(2):
+        columns = load_columns(str(path), cache_dir=str(tmp_path / "cache"))
+        assert list(columns) == ["x", "y"]
+        assert all(len(c) == 0 for c in columns.values())
+
+
+def test_fresh_and_cached_loads_return_the_same_type(tmp_path):
+    path = tmp_path / "path.csv"
+    path.write_text("x,y\n1,2\n3,4\n")
+    cache_dir = str(tmp_path / "cache")
+    fresh = load_columns(str(path), cache_dir=cache_dir)
+    cached = load_columns(str(path), cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    for name in ("x", "y"):
+        assert type(fresh[name]) is type(cached[name])
+        assert not fresh[name].flags.writeable
+        assert not cached[name].flags.writeable
+        assert fresh[name].tolist() == cached[name].tolist()
+
+
+def test_default_load_writes_nothing(tmp_path):
+    path = tmp_path / "path.csv"
+    path.write_text("x,y\n1,2\n")
+    load_columns(str(path))
+    assert os.listdir(tmp_path) == ["path.csv"]
+
+
+@pytest.mark.skipif(not os.path.exists(MIRROR), reason="other project not checked out")
+def test_matches_other_project_copy():
+    assert _code(os.path.join(ROOT, "csv_columns.py")) == _code(MIRROR)
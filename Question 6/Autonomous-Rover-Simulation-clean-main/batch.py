@@ -0,0 +1,101 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from headless import run_headless
+
+
+# PurePursuit parameters that can be swept, with their CLI flags
+TUNABLE = ("ld", "max_v", "max_w", "goal_radius", "stop_d", "slow_d", "min_d")
+
+RESULT_FIELDS = (
+    "reached_goal", "time_to_goal", "steps", "collisions",
+    "min_clearance", "mean_path_error", "max_path_error", "wall_time",
+)
+
+
+def param_grid(**values):
+    """
+    Cartesian product of parameter value lists.
+
+    param_grid(ld=[0.3, 0.5], max_v=[4.0, 6.0]) -> 4 parameter dicts
+    """
+    names = list(values)
+    return [
+        dict(zip(names, combo))
+        for combo in itertools.product(*(values[n] for n in names))
+    ]
+
+
+def _run_job(job):
+    params, seed, max_steps = job
+    result = run_headless(max_steps=max_steps, params=params, seed=seed)
+    row = dict(params)
+    row["seed"] = seed
+    row.update({k: result[k] for k in RESULT_FIELDS})
+    return row
+
+
+def run_batch(param_sets, seeds=(0,), max_steps=20000, workers=None):
+    """
+    Run one headless episode per (parameter set, seed) pair
+    in a process pool.
+
+    Returns the result rows in job order.
+    """
+    jobs = [
+        (params, seed, max_steps)
+        for params in param_sets
+        for seed in seeds
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_job, jobs, chunksize=1))
+
+
+def write_results(rows, filename):
+    fields = []
+    for row in rows:
+        for key in row:
+            if key not in fields:
+                fields.append(key)
+
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Run headless episodes over a parameter grid in parallel"
+    )
+    for name in TUNABLE:
+        parser.add_argument("--" + name.replace("_", "-"), type=float, nargs="+",
+                            help=f"values of {name} to sweep")
+    parser.add_argument("--params-file",
+                        help="JSON list of parameter dicts (instead of a grid)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--steps", type=int, default=20000,
+                        help="max steps per episode")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="batch_results.csv")
+    args = parser.parse_args()
+
+    if args.params_file:
+        with open(args.params_file) as f:
+            param_sets = json.load(f)
+    else:
+        param_sets = param_grid(**{
+            name: getattr(args, name)
+            for name in TUNABLE
+            if getattr(args, name) is not None
+        })
+
+    rows = run_batch(param_sets, args.seeds, args.steps, args.workers)
+    write_results(rows, args.out)
+
+    reached = sum(1 for row in rows if row["reached_goal"])
+    print(f"{len(rows)} episodes, {reached} reached the goal -> {args.out}")
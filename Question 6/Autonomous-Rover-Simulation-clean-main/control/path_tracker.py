@@ -0,0 +1,215 @@
+import math
+from bisect import bisect_left
+import numpy as np
+
+
+class KDTree:
+    def __init__(self, points, leaf_size=16):
+        """
+        Static 2D KD-tree over an (N, 2) array.
+
+        Nodes are kept in flat lists; every node owns a contiguous
+        range of `order`, so leaves are scanned with NumPy.
+        """
+        self.points = np.asarray(points, dtype=float)
+        self.order = np.arange(len(self.points))
+        self.leaf_size = leaf_size
+
+        self.start = []
+        self.stop = []
+        self.box_min = []
+        self.box_max = []
+        self.children = []
+
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def _build(self, start, stop):
+        node = len(self.start)
+        idx = self.order[start:stop]
+        pts = self.points[idx]
+
+        self.start.append(start)
+        self.stop.append(stop)
+        self.box_min.append(pts.min(axis=0))
+        self.box_max.append(pts.max(axis=0))
+        self.children.append(None)
+
+        if stop - start > self.leaf_size:
+            # split on the wider axis at the median
+            axis = int(np.argmax(self.box_max[node] - self.box_min[node]))
+            mid = (stop - start) // 2
+            part = np.argpartition(pts[:, axis], mid)
+            self.order[start:stop] = idx[part]
+
+            left = self._build(start, start + mid)
+            right = self._build(start + mid, stop)
+            self.children[node] = (left, right)
+
+        return node
+
+    def _box_dist2(self, node, x, y):
+        dx = max(self.box_min[node][0] - x, 0.0, x - self.box_max[node][0])
+        dy = max(self.box_min[node][1] - y, 0.0, y - self.box_max[node][1])
+        return dx * dx + dy * dy
+
+    def nearest(self, x, y):
+        """Returns (distance, index) of the closest point."""
+        best_d2 = math.inf
+        best_i = -1
+        stack = [0] if self.start else []
+
+        while stack:
+            node = stack.pop()
+            if self._box_dist2(node, x, y) >= best_d2:
+                continue
+
+            children = self.children[node]
+            if children is None:
+                idx = self.order[self.start[node]:self.stop[node]]
+                d = self.points[idx] - (x, y)
+                d2 = np.einsum("ij,ij->i", d, d)
+                k = int(np.argmin(d2))
+                if d2[k] < best_d2:
+                    best_d2 = float(d2[k])
+                    best_i = int(idx[k])
+                continue
+
+            # visit the nearer child first (pushed last)
+            left, right = children
+            if self._box_dist2(left, x, y) < self._box_dist2(right, x, y):
+                stack.extend((right, left))
+            else:
+                stack.extend((left, right))
+
+        return math.sqrt(best_d2), best_i
+
+    def within(self, x, y, r):
+        """Indices of all points within distance r of (x, y)."""
+        r2 = r * r
+        found = []
+        stack = [0] if self.start else []
+
+        while stack:
+            node = stack.pop()
+            if self._box_dist2(node, x, y) > r2:
+                continue
+
+            children = self.children[node]
+            if children is None:
+                idx = self.order[self.start[node]:self.stop[node]]
+                d = self.points[idx] - (x, y)
+                found.extend(idx[np.einsum("ij,ij->i", d, d) <= r2].tolist())
+            else:
+                stack.extend(children)
+
+        return found
+
+
+class PathTracker:
+    def __init__(self, path, window=2.0, recovery_dist=1.0):
+        """
+        Closest-point and lookahead queries on a waypoint path.
+
+        path          : list[(x, y)] waypoints (at least one)
+        window        : arc length [m] searched around the last
+                        closest point on each update
+        recovery_dist : if the windowed search ends up farther than
+                        this from the path, fall back to a global
+                        KD-tree search (e.g. after a detour)
+        """
+        self.points = np.asarray(path, dtype=float).reshape(-1, 2)
+        if len(self.points) < 2:
+            # a single waypoint is a zero-length segment
+            self.points = np.vstack((self.points, self.points))
+
+        self.points_list = [tuple(p) for p in self.points.tolist()]
+        self.seg_start = self.points[:-1]
+        self.seg_vec = self.points[1:] - self.points[:-1]
+        self.seg_len2 = np.einsum("ij,ij->i", self.seg_vec, self.seg_vec)
+        seg_len = np.sqrt(self.seg_len2)
+        self.max_seg_len = float(seg_len.max())
+
+        # arc length at every waypoint
+        self.s = np.concatenate(([0.0], np.cumsum(seg_len)))
+        self.s_list = self.s.tolist()
+        self.length = self.s_list[-1]
+
+        self.window = window
+        self.recovery_dist = recovery_dist
+        self.tree = KDTree(self.points)
+
+        # progress along the path
+        self.s_cur = 0.0
+        self.error = 0.0
+
+    def _closest_on(self, segs, x, y):
+        """Closest point on the given segment indices -> (dist, s)."""
+        ap = np.array((x, y)) - self.seg_start[segs]
+        ab = self.seg_vec[segs]
+        len2 = self.seg_len2[segs]
+        t = np.einsum("ij,ij->i", ap, ab) / np.where(len2 > 0, len2, 1.0)
+        t = np.clip(t, 0.0, 1.0)
+
+        d = ap - t[:, None] * ab
+        d2 = np.einsum("ij,ij->i", d, d)
+        k = int(np.argmin(d2))
+        seg = int(segs[k])
+        s = self.s_list[seg] + t[k] * (self.s_list[seg + 1] - self.s_list[seg])
+        return math.sqrt(d2[k]), s
+
+    def closest(self, x, y):
+        """
+        Global closest point on the path -> (dist, s).
+
+        Any segment whose closest point is within d of (x, y) has an
+        end point within d + max_seg_len / 2, so only segments next to
+        those waypoints need checking.
+        """
+        d_vertex, _ = self.tree.nearest(x, y)
+        near = self.tree.within(x, y, d_vertex + 0.5 * self.max_seg_len)
+
+        n_segs = len(self.seg_len2)
+        segs = set()
+        for i in near:
+            if i > 0:
+                segs.add(i - 1)
+            if i < n_segs:
+                segs.add(i)
+        return self._closest_on(np.fromiter(segs, dtype=int), x, y)
+
+    def update(self, x, y):
+        """
+        Advance the tracked closest point for a new position.
+
+        Searches the arc-length window around the previous closest
+        point, and recovers with a global search when that window
+        no longer contains the robot's neighbourhood.
+
+        Returns (dist, s).
+        """
+        lo = max(bisect_left(self.s_list, self.s_cur - self.window) - 1, 0)
+        hi = min(bisect_left(self.s_list, self.s_cur + self.window) + 1,
+                 len(self.seg_len2))
+        dist, s = self._closest_on(np.arange(lo, hi), x, y)
+
+        if dist > self.recovery_dist:
+            dist, s = self.closest(x, y)
+
+        self.s_cur = s
+        self.error = dist
+        return dist, s
+
+    def lookahead(self, x, y, ld):
+        """
+        First waypoint past the tracked closest point that is at
+        least ld away from (x, y); the last waypoint if none is.
+        """
+        # a waypoint closer than ld - error in arc length can't be ld away
+        i = bisect_left(self.s_list, self.s_cur + ld - self.error)
+        while i < len(self.points_list):
+            px, py = self.points_list[i]
+            if math.hypot(px - x, py - y) >= ld:
+                return px, py
+            i += 1
+        return self.points_list[-1]
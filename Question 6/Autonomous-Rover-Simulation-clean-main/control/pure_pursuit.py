@@ -0,0 +1,96 @@
+import math
+from control.path_tracker import PathTracker
+
+
+class PurePursuit:
+    def __init__(
+        self,
+        path,
+        ld=0.3,
+        max_v=6.0,
+        max_w=6.0,
+        goal_radius=0.4,
+        stop_d=0.4,
+        slow_d=0.8,
+        min_d=0.3,
+        n_beams=36,
+        angles_deg=None
+    ):
+        """
+        Pure-pursuit path follower with LiDAR-based slow down,
+        back off and obstacle avoidance.
+
+        path    : list[(x, y)] waypoints
+        ld      : lookahead distance
+        stop_d  : stop if anything is closer than this
+        slow_d  : start slowing down for obstacles in front
+        min_d   : back off if something in front is closer than this
+        n_beams : LiDAR beams, evenly spaced from 0 deg (straight ahead)
+        angles_deg : actual beam angles (LidarScan.angles_deg), used
+                     instead of n_beams when given
+        """
+        self.path = path
+        self.tracker = PathTracker(path)
+        self.ld = ld
+        self.max_v = max_v
+        self.max_w = max_w
+        self.goal_radius = goal_radius
+        self.stop_d = stop_d
+        self.slow_d = slow_d
+        self.min_d = min_d
+
+        self.reached_goal = False
+
+        # beam groups by angle: front = +-50 deg, sides = 10..50 deg
+        if angles_deg is None:
+            step = 360.0 / n_beams
+            angles = [i * step for i in range(n_beams)]
+        else:
+            angles = list(angles_deg)
+        self.front_beams = [i for i, a in enumerate(angles) if a <= 50 or a >= 310]
+        self.left_beams = [i for i, a in enumerate(angles) if 10 <= a <= 50]
+        self.right_beams = [i for i, a in enumerate(angles) if 310 <= a <= 350]
+
+    def compute(self, x, y, theta, lidar_ranges):
+        """
+        One control step from the pose estimate and LiDAR ranges.
+
+        Returns (v, w).
+        """
+        min_front = min([lidar_ranges[i] for i in self.front_beams])
+        min_left = min([lidar_ranges[i] for i in self.left_beams])
+        min_right = min([lidar_ranges[i] for i in self.right_beams])
+        min_all = min(lidar_ranges)
+
+        end_x, end_y = self.path[-1]
+        if math.hypot(end_x - x, end_y - y) < self.goal_radius:
+            self.reached_goal = True
+            return 0.0, 0.0
+
+        self.tracker.update(x, y)
+        goal_x, goal_y = self.tracker.lookahead(x, y, self.ld)
+
+        dx = goal_x - x
+        dy = goal_y - y
+        ly = -math.sin(theta) * dx + math.cos(theta) * dy
+        curvature = 2 * ly / (self.ld ** 2)
+        v = self.max_v
+        w = curvature * v
+        w = max(-self.max_w, min(self.max_w, w))
+
+        if min_all < self.stop_d:
+            v = 0.0
+            w = 0.0
+        elif min_front < self.min_d:
+            v = -0.2 * self.max_v
+            w = 0.0
+        elif min_front < self.slow_d:
+            scale = (min_front - self.min_d) / (self.slow_d - self.min_d)
+            v = self.max_v * scale
+            avoid_bias = 1.5 * (min_right - min_left) / (min_right + min_left + 0.01)
+            w += avoid_bias
+            w = max(-self.max_w, min(self.max_w, w))
+        else:
+            v = self.max_v
+
+        return v, w
@@ -0,0 +1,112 @@
+import random
+import time
+import numpy as np
+from robot import Robot
+from sensors.lidar import LidarScan
+from control.pure_pursuit import PurePursuit
+from utils.config import COLLISION_MARGIN, ROBOT_RADIUS
+from utils.geometry import polyline_distance
+from utils.path_io import load_path
+
+
+def run_headless(
+    max_steps=20000,
+    dt=0.01,
+    params=None,
+    seed=None,
+    lidar_backend="analytic",
+    path=None
+):
+    """
+    Run the autonomous controller without any visualization,
+    as fast as the CPU allows.
+
+    Stops after max_steps or once the goal is reached.
+
+    params : keyword arguments for PurePursuit (ld, max_v, ...)
+    seed   : seeds the LiDAR noise for repeatable runs
+
+    Returns a dict with the run summary and metrics:
+        time_to_goal    : simulated seconds, None if not reached
+        collisions      : times the rover's body (ROBOT_RADIUS around
+                          its centre) came within COLLISION_MARGIN of
+                          an obstacle
+        min_clearance   : closest ground-truth approach of the rover's
+                          centre to an obstacle
+        mean/max_path_error : ground-truth distance to the path
+    """
+    if seed is not None:
+        random.seed(seed)
+        # the numpy LiDAR backend draws its noise from numpy
+        np.random.seed(seed)
+
+    if path is None:
+        path = load_path()
+
+    lidar = LidarScan(max_range=4.0, backend=lidar_backend)
+    robot = Robot(visualize=False)
+    controller = PurePursuit(path, angles_deg=lidar.angles_deg, **(params or {}))
+    path_points = np.asarray(path, dtype=float)
+
+    collisions = 0
+    in_collision = False
+    min_clearance = lidar.max_range
+    path_error_sum = 0.0
+    max_path_error = 0.0
+
+    start = time.perf_counter()
+    steps = 0
+    while steps < max_steps and not controller.reached_goal:
+        real_x, real_y, real_theta = robot.get_ground_truth()
+        ideal_x, ideal_y, ideal_theta = robot.get_odometry()
+        lidar_ranges, lidar_points, lidar_rays, lidar_hits = lidar.get_scan((real_x, real_y, real_theta))
+
+        v, w = controller.compute(ideal_x, ideal_y, ideal_theta, lidar_ranges)
+
+        robot.step(lidar_points, lidar_rays, lidar_hits, v, w, dt)
+        steps += 1
+
+        # metrics on the new ground-truth pose
+        real_x, real_y, _ = robot.get_ground_truth()
+        clearance = lidar.index.clearance(real_x, real_y, lidar.max_range)
+        min_clearance = min(min_clearance, clearance)
+        if clearance <= ROBOT_RADIUS + COLLISION_MARGIN:
+            if not in_collision:
+                collisions += 1
+            in_collision = True
+        else:
+            in_collision = False
+
+        path_error = polyline_distance(real_x, real_y, path_points)
+        path_error_sum += path_error
+        max_path_error = max(max_path_error, path_error)
+
+    wall_time = time.perf_counter() - start
+    sim_time = round(steps * dt, 9)
+
+    return {
+        "steps": steps,
+        "reached_goal": controller.reached_goal,
+        "sim_time": sim_time,
+        "time_to_goal": sim_time if controller.reached_goal else None,
+        "collisions": collisions,
+        "min_clearance": min_clearance,
+        "mean_path_error": path_error_sum / steps if steps else 0.0,
+        "max_path_error": max_path_error,
+        "wall_time": wall_time,
+        "steps_per_sec": steps / wall_time if wall_time > 0 else float("inf"),
+    }
+
+
+def print_summary(result):
+    print(
+        f"{result['steps']} steps ({result['sim_time']:.2f} s simulated) "
+        f"in {result['wall_time']:.2f} s -> {result['steps_per_sec']:.0f} steps/sec, "
+        f"goal {'reached' if result['reached_goal'] else 'NOT reached'}"
+    )
+    print(
+        f"collisions {result['collisions']}, "
+        f"min clearance {result['min_clearance']:.3f} m, "
+        f"path error mean {result['mean_path_error']:.3f} m / "
+        f"max {result['max_path_error']:.3f} m"
+    )
@@ -1,8 +1,8 @@
 from robot import Robot
 from sensors.lidar import LidarScan
-import matplotlib.pyplot as plt
-import math
-import csv
+from control.pure_pursuit import PurePursuit
+from utils.path_io import load_path
+import argparse
 
 # -----------------------------------------------------
 # Runtime modes & visualization toggles
@@ -70,6 +70,22 @@ def on_key(event):
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Autonomous rover simulator")
+    parser.add_argument("--headless", action="store_true",
+                        help="run AUTO mode without visualization, as fast as possible")
+    parser.add_argument("--steps", type=int, default=20000,
+                        help="max steps for --headless (stops early at the goal)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="LiDAR noise seed for --headless")
+    args = parser.parse_args()
+
+    if args.headless:
+        from headless import run_headless, print_summary
+        print_summary(run_headless(max_steps=args.steps, seed=args.seed))
+        raise SystemExit
+
+    import matplotlib.pyplot as plt
+
     lidar = LidarScan(max_range=4.0)
     robot = Robot()
 
@@ -81,23 +97,8 @@ if __name__ == "__main__":
 
     dt = 0.01 
 
-    path=[]
-    with open('Autonomous-Rover-Simulation-clean-main\path.csv', 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            path.append((float(row['x']), float(row['y'])))
-
-    ld=0.3
-    max_v=6.0
-    max_w=6.0
-    goal_radius=0.4
-    pp_idx=0
-    stop_d=0.4
-    slow_d=0.8
-    min_d=0.3
-    front_beams=list(range(0,6))+list(range(31,36))
-    left_beams=list(range(1,6))
-    right_beams=list(range(31,36))
+    path = load_path()
+    controller = PurePursuit(path, angles_deg=lidar.angles_deg)
 
 
     # -------------------------------------------------
@@ -127,47 +128,8 @@ if __name__ == "__main__":
             # Required outputs:
             #   - v, w (linear and angular velocity commands)
 
-            min_front=min([lidar_ranges[i] for i in front_beams])
-            min_left=min([lidar_ranges[i] for i in left_beams])
-            min_right=min([lidar_ranges[i] for i in right_beams])
-            min_all=min(lidar_ranges)
-
-
-            end_x, end_y = path[-1]
-            if math.hypot(end_x - ideal_x, end_y - ideal_y) < goal_radius:
-               v=0.0
-               w=0.0
-            else:
-                goal_x,goal_y=path[-1]
-                for i in range(pp_idx,len(path)):
-                    dist = math.hypot(path[i][0] - ideal_x, path[i][1] - ideal_y)
-                    if dist>=ld:
-                        pp_idx=i
-                        goal_x,goal_y=path[i]
-                        break
-            
-                dx=goal_x-ideal_x
-                dy=goal_y-ideal_y
-                ly=-math.sin(ideal_theta)*dx+math.cos(ideal_theta)*dy
-                curvature=2*ly/(ld**2)
-                v=max_v
-                w=curvature*v
-                w=max(-max_w,min(max_w,w))
-
-                if min_all<stop_d:
-                    v=0.0
-                    w=0.0
-                elif min_front<min_d:
-                    v=-0.2*max_v
-                    w=0.0
-                elif min_front<slow_d:
-                    scale = (min_front - min_d) / (slow_d - min_d)
-                    v = max_v * scale
-                    avoid_bias = 1.5 * (min_right - min_left) / (min_right + min_left + 0.01)
-                    w += avoid_bias
-                    w = max(-max_w, min(max_w, w))
-                else:   
-                    v=max_v
+            # pure pursuit + LiDAR avoidance, see control/pure_pursuit.py
+            v, w = controller.compute(ideal_x, ideal_y, ideal_theta, lidar_ranges)
 
 
             # ---------------------------------------------
@@ -1,5 +1,6 @@
 import math
-from utils.geometry import normalize_angle
+import numpy as np
+from utils.geometry import normalize_angle, normalize_angles
 
 
 class Odometry:
@@ -34,4 +35,53 @@ class Odometry:
         self.x += v * math.cos(self.theta) * dt
         self.y += v * math.sin(self.theta) * dt
         self.theta += omega * dt
-        self.theta = normalize_angle(self.theta)
\ No newline at end of file
+        self.theta = normalize_angle(self.theta)
+
+
+class BatchOdometry:
+    def __init__(self, n, x=5.0, y=2.5, theta=0.0):
+        """
+        Ground truth and odometry for n rovers, stored as (n,) arrays.
+
+        x, y, theta may be scalars (same start for all rovers)
+        or (n,) arrays.
+        """
+        self.n = n
+
+        # Ground truth poses
+        self.gt_x = np.full(n, x, dtype=float)
+        self.gt_y = np.full(n, y, dtype=float)
+        self.gt_theta = np.full(n, theta, dtype=float)
+
+        # Estimated poses (odometry)
+        self.x = self.gt_x.copy()
+        self.y = self.gt_y.copy()
+        self.theta = self.gt_theta.copy()
+
+    def update(self, v, omega, dt):
+        """
+        Same integration as Odometry.update, for all rovers at once.
+        v and omega may be scalars or (n,) arrays.
+        """
+
+        # --------------------------------
+        # Ground truth motion integration
+        # --------------------------------
+        self.gt_x += v * np.cos(self.gt_theta) * dt
+        self.gt_y += v * np.sin(self.gt_theta) * dt
+        self.gt_theta = normalize_angles(self.gt_theta + omega * dt)
+
+        # --------------------------------
+        # Odometry motion integration
+        # --------------------------------
+        self.x += v * np.cos(self.theta) * dt
+        self.y += v * np.sin(self.theta) * dt
+        self.theta = normalize_angles(self.theta + omega * dt)
+
+    def get_ground_truth(self):
+        """(n, 3) array of ground-truth poses."""
+        return np.stack((self.gt_x, self.gt_y, self.gt_theta), axis=-1)
+
+    def get_odometry(self):
+        """(n, 3) array of odometry poses."""
+        return np.stack((self.x, self.y, self.theta), axis=-1)
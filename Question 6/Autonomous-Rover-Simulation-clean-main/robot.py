@@ -1,13 +1,21 @@
 from odometry import Odometry
 from perception.obstacle_detector import ObstacleDetector
-from visualize import Visualizer
 
 
 class Robot:
-    def __init__(self):
+    def __init__(self, visualize=True):
+        """
+        visualize : create the matplotlib debug view. When False,
+                    matplotlib is never imported (headless runs).
+        """
         self.odom = Odometry()
         self.detector = ObstacleDetector()
-        self.viz = Visualizer()
+
+        if visualize:
+            from visualize import Visualizer
+            self.viz = Visualizer()
+        else:
+            self.viz = None
 
     def step(
         self,
@@ -38,6 +46,9 @@ class Robot:
         self.odom.update(v, w, dt)
 
         # Update visualization
+        if self.viz is None:
+            return
+
         self.viz.update(
             self.odom,
             lidar_points,
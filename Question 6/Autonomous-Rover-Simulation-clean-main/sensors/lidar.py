@@ -1,16 +1,186 @@
 import math
 import random
-from world.obstacles import get_world_obstacles
+import numpy as np
+from world.obstacles import get_world_obstacles, obstacles_to_array
+from world.spatial_index import ObstacleGrid
+
+
+BACKENDS = ("analytic", "march", "numpy")
+
+
+def cast_rays(ox, oy, angles, boxes, max_range):
+    """
+    Batched slab test of rays against packed rectangles.
+
+    ox, oy : ray origins, broadcastable against angles[..., 0]
+    angles : world-frame ray angles [rad], shape (..., N)
+    boxes  : (K, 4) array from obstacles_to_array
+
+    Returns (dist, hit) arrays of shape (..., N); rays that
+    miss everything report max_range and hit=False.
+    """
+    ox = np.asarray(ox, dtype=float)[..., None, None]
+    oy = np.asarray(oy, dtype=float)[..., None, None]
+    dx = np.cos(angles)[..., None]
+    dy = np.sin(angles)[..., None]
+
+    t_near = np.zeros(np.broadcast_shapes(dx.shape, (len(boxes),)))
+    t_far = np.full_like(t_near, max_range)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for o, d, lo, hi in (
+            (ox, dx, boxes[:, 0], boxes[:, 2]),
+            (oy, dy, boxes[:, 1], boxes[:, 3]),
+        ):
+            t0 = (lo - o) / d
+            t1 = (hi - o) / d
+
+            # rays parallel to a slab only pass if they start inside it
+            parallel = d == 0.0
+            inside = (o >= lo) & (o <= hi)
+            t0 = np.where(parallel, np.where(inside, -np.inf, np.inf), t0)
+            t1 = np.where(parallel, np.inf, t1)
+
+            t_near = np.maximum(t_near, np.minimum(t0, t1))
+            t_far = np.minimum(t_far, np.maximum(t0, t1))
+
+    t_hit = np.where(t_near <= t_far, t_near, np.inf).min(axis=-1, initial=np.inf)
+    hit = np.isfinite(t_hit)
+    return np.where(hit, t_hit, max_range), hit
 
 
 class LidarScan:
-    def __init__(self, max_range=4.0, angle_step_deg=10):
+    def __init__(self, max_range=4.0, angle_step_deg=10, backend="analytic"):
+        """
+        backend : "analytic" -> closed-form ray/rectangle slab test
+                  "march"    -> original ray march + bisection (reference)
+                  "numpy"    -> slab test for all beams in one batch
+
+        angle_step_deg may be fractional (e.g. 0.5 for 720 beams).
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown lidar backend: {backend!r}")
+
         self.max_range = max_range
         self.angle_step = angle_step_deg
+        self.backend = backend
         self.obstacles = get_world_obstacles()
+        self.boxes = obstacles_to_array(self.obstacles)
+        self.index = ObstacleGrid(self.obstacles)
+
+        # fixed angle list (deterministic ordering); an integer step
+        # that doesn't divide 360 keeps its short last gap
+        self.angles_deg = np.arange(0, 360, self.angle_step).tolist()
+        self.angles_rad = np.radians(self.angles_deg)
+
+    def _cast_march(self, rx, ry, ray_angle):
+        """Ray march in 5 cm steps, then bisect the hit interval."""
+        step = 0.05
+        d_prev = 0.0
+        d = 0.0
+        hit = False
+
+        # coarse ray march (real geometry)
+        while d < self.max_range:
+            px = rx + d * math.cos(ray_angle)
+            py = ry + d * math.sin(ray_angle)
+
+            if self.index.contains(px, py):
+                hit = True
+                break
+
+            d_prev = d
+            d += step
+
+        # refine hit location
+        if hit:
+            lo, hi = d_prev, d
+            for _ in range(10):
+                mid = 0.5 * (lo + hi)
+                mx = rx + mid * math.cos(ray_angle)
+                my = ry + mid * math.sin(ray_angle)
+
+                if self.index.contains(mx, my):
+                    hi = mid
+                else:
+                    lo = mid
+
+            return lo, True
+
+        return self.max_range, False
+
+    def _cast_analytic(self, rx, ry, ray_angle):
+        """Exact range to the nearest obstacle boundary along the ray."""
+        nearest, _ = self.index.raycast(
+            rx, ry, math.cos(ray_angle), math.sin(ray_angle), self.max_range
+        )
+
+        if nearest is None:
+            return self.max_range, False
+        return nearest, True
+
+    def get_scan_arrays(self, robot_pose):
+        """
+        Batched scan returning NumPy arrays instead of lists.
+
+        Returns:
+            ranges : (N,)   noisy ranges
+            points : (N, 2) robot-frame end points
+            ends   : (N, 2) world-frame beam end points
+            hit    : (N,)   True where the beam hit an obstacle
+        """
+        dist, points, ends, hit = self.get_scan_batch([robot_pose])
+        return dist[0], points[0], ends[0], hit[0]
 
-        # fixed angle list (deterministic ordering)
-        self.angles_deg = list(range(0, 360, self.angle_step))
+    def get_scan_batch(self, robot_poses, max_elements=4_000_000):
+        """
+        get_scan_arrays for many robots at once.
+
+        robot_poses  : (M, 3) array of (x, y, theta)
+        max_elements : cap on robots x beams x obstacles evaluated
+                       per chunk, to bound memory
+
+        Returns ranges (M, N), points (M, N, 2), ends (M, N, 2)
+        and hit (M, N).
+        """
+        poses = np.asarray(robot_poses, dtype=float).reshape(-1, 3)
+        rx = poses[:, 0]
+        ry = poses[:, 1]
+        ray_angles = self.angles_rad[None, :] + poses[:, 2:3]
+
+        # only obstacles within range of some robot can be hit
+        if len(poses):
+            nearby = self.index.query_box(
+                rx.min() - self.max_range, ry.min() - self.max_range,
+                rx.max() + self.max_range, ry.max() + self.max_range
+            )
+        else:
+            nearby = []
+        boxes = self.boxes[nearby]
+
+        dist = np.empty(ray_angles.shape)
+        hit = np.empty(ray_angles.shape, dtype=bool)
+        chunk = max(1, max_elements // max(1, len(self.angles_rad) * len(boxes)))
+        for i in range(0, len(poses), chunk):
+            s = slice(i, i + chunk)
+            dist[s], hit[s] = cast_rays(
+                rx[s], ry[s], ray_angles[s], boxes, self.max_range
+            )
+
+        # add measurement noise
+        dist += np.random.normal(0.0, 0.01, dist.shape)
+        dist = np.clip(dist, 0.0, self.max_range)
+
+        points = np.stack(
+            (dist * np.cos(self.angles_rad), dist * np.sin(self.angles_rad)),
+            axis=-1
+        )
+        ends = np.stack(
+            (rx[:, None] + dist * np.cos(ray_angles),
+             ry[:, None] + dist * np.sin(ray_angles)),
+            axis=-1
+        )
+        return dist, points, ends, hit
 
     def get_scan(self, robot_pose):
         """
@@ -24,6 +194,21 @@ class LidarScan:
         """
         rx, ry, rtheta = robot_pose
 
+        if self.backend == "numpy":
+            dist, points, ends, hit = self.get_scan_arrays(robot_pose)
+            end_list = [tuple(p) for p in ends.tolist()]
+            return (
+                dist.tolist(),
+                [tuple(p) for p in points.tolist()],
+                [((rx, ry), end) for end in end_list],
+                [end for end, h in zip(end_list, hit.tolist()) if h],
+            )
+
+        if self.backend == "march":
+            cast = self._cast_march
+        else:
+            cast = self._cast_analytic
+
         lidar_ranges = []
         lidar_points = []
         lidar_rays = []
@@ -32,43 +217,7 @@ class LidarScan:
         for angle_deg in self.angles_deg:
             ray_angle = math.radians(angle_deg) + rtheta
 
-            step = 0.05
-            d_prev = 0.0
-            d = 0.0
-            hit = False
-
-            # coarse ray march (real geometry)
-            while d < self.max_range:
-                px = rx + d * math.cos(ray_angle)
-                py = ry + d * math.sin(ray_angle)
-
-                for obs in self.obstacles:
-                    if obs.contains(px, py):
-                        hit = True
-                        break
-
-                if hit:
-                    break
-
-                d_prev = d
-                d += step
-
-            # refine hit location
-            if hit:
-                lo, hi = d_prev, d
-                for _ in range(10):
-                    mid = 0.5 * (lo + hi)
-                    mx = rx + mid * math.cos(ray_angle)
-                    my = ry + mid * math.sin(ray_angle)
-
-                    if any(obs.contains(mx, my) for obs in self.obstacles):
-                        hi = mid
-                    else:
-                        lo = mid
-
-                dist = lo
-            else:
-                dist = self.max_range
+            dist, hit = cast(rx, ry, ray_angle)
 
             # add measurement noise
             dist += random.gauss(0.0, 0.01)
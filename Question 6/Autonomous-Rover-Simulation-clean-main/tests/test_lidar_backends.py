@@ -0,0 +1,95 @@
+import math
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensors.lidar import LidarScan  # noqa: E402
+from world.obstacles import ARENA_SIZE, WALL_THICKNESS  # noqa: E402
+
+MARCH_STEP = 0.05       # LidarScan._cast_march's coarse step
+TOLERANCE = 1e-3        # bisection leaves ~5e-5 m, far below the 0.01 m noise
+
+
+def random_free_poses(scan, n, seed=0):
+    """n poses in the arena, clear of every obstacle by at least 0.2 m."""
+    rng = random.Random(seed)
+    lo = WALL_THICKNESS + 0.2
+    hi = ARENA_SIZE - WALL_THICKNESS - 0.2
+    poses = []
+    while len(poses) < n:
+        x, y = rng.uniform(lo, hi), rng.uniform(lo, hi)
+        if min(o.distance(x, y) for o in scan.obstacles) >= 0.2:
+            poses.append((x, y, rng.uniform(-math.pi, math.pi)))
+    return poses
+
+
+def grazes_corner(scan, x, y, angle, dist):
+    """
+    True if the beam enters an obstacle within one march step of a
+    corner: the marcher can step over such a clip and see further.
+    """
+    hx = x + dist * math.cos(angle)
+    hy = y + dist * math.sin(angle)
+    return any(
+        math.hypot(hx - cx, hy - cy) <= MARCH_STEP
+        for o in scan.obstacles for cx, cy in o.corners()
+    )
+
+
+def test_analytic_matches_march():
+    analytic = LidarScan(backend="analytic")
+    march = LidarScan(backend="march")
+    poses = random_free_poses(analytic, 100)
+
+    grazing = 0
+    beams = 0
+    for pose in poses:
+        # same noise draws for both backends
+        random.seed(1)
+        ranges_a = analytic.get_scan(pose)[0]
+        random.seed(1)
+        ranges_m = march.get_scan(pose)[0]
+
+        for angle_deg, r_a, r_m in zip(analytic.angles_deg, ranges_a, ranges_m):
+            beams += 1
+            if abs(r_a - r_m) <= TOLERANCE:
+                continue
+
+            angle = math.radians(angle_deg) + pose[2]
+            exact, hit = analytic._cast_analytic(pose[0], pose[1], angle)
+            assert hit and r_m > r_a, (pose, angle_deg, r_a, r_m)
+            assert grazes_corner(analytic, pose[0], pose[1], angle, exact), \
+                (pose, angle_deg, r_a, r_m)
+            grazing += 1
+
+    # corner clips are rare
+    assert grazing <= 0.01 * beams
+
+
+
+def test_numpy_matches_analytic():
+    analytic = LidarScan(backend="analytic")
+    batched = LidarScan(backend="numpy")
+    poses = random_free_poses(analytic, 50, seed=1)
+
+    dist, hit = [], []
+    for x, y, theta in poses:
+        row = [analytic._cast_analytic(x, y, a + theta) for a in analytic.angles_rad]
+        dist.append([d for d, _ in row])
+        hit.append([h for _, h in row])
+
+    np.random.seed(0)
+    ranges, _, _, hit_b = batched.get_scan_batch(poses)
+    # the batch adds N(0, 0.01) noise; 6 sigma
+    np.testing.assert_allclose(ranges, np.clip(dist, 0.0, batched.max_range), atol=0.06)
+    np.testing.assert_array_equal(hit_b, hit)
+
+
+def test_integer_step_keeps_old_beams():
+    # range(0, 360, step) as before, even when step doesn't divide 360
+    assert LidarScan(angle_step_deg=7).angles_deg == list(range(0, 360, 7))
+    assert len(LidarScan(angle_step_deg=0.5).angles_deg) == 720
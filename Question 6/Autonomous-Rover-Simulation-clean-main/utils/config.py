@@ -1,2 +1,3 @@
 ROBOT_RADIUS = 0.5     # meters (50 cm)
 STOP_DISTANCE = 1.0   # safety distance in meters
+COLLISION_MARGIN = 0.0     # headless runs: a collision is clearance within ROBOT_RADIUS + this
@@ -1,5 +1,25 @@
 import math
+import numpy as np
 
 
 def normalize_angle(theta):
     return math.atan2(math.sin(theta), math.cos(theta))
+
+
+def normalize_angles(theta):
+    """Element-wise normalize_angle for NumPy arrays."""
+    return np.arctan2(np.sin(theta), np.cos(theta))
+
+
+def polyline_distance(px, py, points):
+    """Distance from (px, py) to the polyline through points (N, 2)."""
+    a = points[:-1]
+    ab = points[1:] - a
+    ap = np.array((px, py)) - a
+
+    len2 = np.einsum("ij,ij->i", ab, ab)
+    t = np.einsum("ij,ij->i", ap, ab) / np.where(len2 > 0, len2, 1.0)
+    t = np.clip(t, 0.0, 1.0)
+
+    d = ap - t[:, None] * ab
+    return math.sqrt(np.einsum("ij,ij->i", d, d).min())
@@ -0,0 +1,21 @@
+import os
+import numpy as np
+from utils.csv_columns import load_columns
+
+
+# path.csv lives in the project root, next to main.py
+PATH_CSV = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "path.csv"
+)
+
+
+def load_path_array(filename=PATH_CSV):
+    """(N, 2) array of waypoints from a CSV with x, y columns."""
+    columns = load_columns(filename)
+    return np.column_stack((columns['x'], columns['y']))
+
+
+def load_path(filename=PATH_CSV):
+    """Read waypoints from a CSV with x, y columns."""
+    return list(map(tuple, load_path_array(filename).tolist()))
@@ -1,5 +1,7 @@
 import math
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PatchCollection
 from matplotlib.patches import Polygon, Circle
 from world.obstacles import get_world_obstacles
 
@@ -15,134 +17,115 @@ class Visualizer:
         self.idea_xs = []
         self.idea_ys = []
 
-    def update(
-        self,
-        odom,
-        lidar_points,
-        lidar_rays,
-        lidar_hits,
-        obstacles,
-        show_lidar=True,
-        show_odom=True
-    ):
-        # Store trajectory history
-        self.real_xs.append(odom.gt_x)
-        self.real_ys.append(odom.gt_y)
-        self.idea_xs.append(odom.x)
-        self.idea_ys.append(odom.y)
+        # artists are created once, on the first update
+        self.fig = None
+        self.dynamic = []
+        self.background = None
 
-        plt.clf()
-        ax = plt.gca()
+    def _build(self):
+        """Create the static scene and the artists updated every frame."""
+        self.fig = plt.gcf()
+        self.fig.clf()
+        ax = self.fig.gca()
         ax.set_aspect("equal", adjustable="box")
         ax.set_xlim(0, ARENA_SIZE)
         ax.set_ylim(0, ARENA_SIZE)
         ax.set_title("Autonomy Debug View")
 
         # --------------------------------
-        # World obstacles
+        # World obstacles (static)
         # --------------------------------
-        for obs in get_world_obstacles():
-            poly = Polygon(
-                obs.corners(),
-                closed=True,
-                facecolor="lightgray",
-                edgecolor="black",
-                linewidth=2.0,
-                hatch="///",
-                alpha=0.9,
-                zorder=2
-            )
-            ax.add_patch(poly)
+        ax.add_collection(PatchCollection(
+            [Polygon(obs.corners(), closed=True)
+             for obs in get_world_obstacles()],
+            facecolor="lightgray",
+            edgecolor="black",
+            linewidth=2.0,
+            hatch="///",
+            alpha=0.9,
+            zorder=2
+        ))
 
         # --------------------------------
         # LiDAR visualization
         # --------------------------------
-        if show_lidar:
-            # LiDAR range circle
-            circle = Circle(
-                (odom.gt_x, odom.gt_y),
-                LIDAR_RANGE,
-                edgecolor="gray",
-                facecolor="none",
-                linewidth=1.0,
-                alpha=0.4,
-                zorder=1
-            )
-            ax.add_patch(circle)
-
-            # LiDAR rays
-            for (x0, y0), (x1, y1) in lidar_rays:
-                ax.plot(
-                    [x0, x1],
-                    [y0, y1],
-                    color="gray",
-                    linewidth=0.6,
-                    alpha=0.35,
-                    zorder=1
-                )
-
-            # LiDAR hit points
-            if lidar_hits:
-                hx, hy = zip(*lidar_hits)
-                ax.scatter(
-                    hx,
-                    hy,
-                    s=3,
-                    color="gray",
-                    alpha=0.9,
-                    zorder=3
-                )
+        self.range_circle = Circle(
+            (0.0, 0.0),
+            LIDAR_RANGE,
+            edgecolor="gray",
+            facecolor="none",
+            linewidth=1.0,
+            alpha=0.4,
+            zorder=1
+        )
+        ax.add_patch(self.range_circle)
+
+        self.rays = LineCollection(
+            [],
+            colors="gray",
+            linewidths=0.6,
+            alpha=0.35,
+            zorder=1
+        )
+        ax.add_collection(self.rays)
+
+        self.hits = ax.scatter(
+            [],
+            [],
+            s=3,
+            color="gray",
+            alpha=0.9,
+            zorder=3
+        )
 
         # --------------------------------
         # Odometry estimate (idea)
         # --------------------------------
-        if show_odom:
-            ax.plot(
-                self.idea_xs,
-                self.idea_ys,
-                linestyle="--",
-                color="red",
-                linewidth=1.5,
-                alpha=0.45,
-                label="Odometry",
-                zorder=3
-            )
-            ax.scatter(
-                [odom.x],
-                [odom.y],
-                color="red",
-                s=40,
-                alpha=0.45,
-                zorder=6
-            )
+        self.odom_line, = ax.plot(
+            [],
+            [],
+            linestyle="--",
+            color="red",
+            linewidth=1.5,
+            alpha=0.45,
+            label="Odometry",
+            zorder=3
+        )
+        self.odom_dot = ax.scatter(
+            [],
+            [],
+            color="red",
+            s=40,
+            alpha=0.45,
+            zorder=6
+        )
 
         # --------------------------------
         # Ground truth
         # --------------------------------
-        ax.plot(
-            self.real_xs,
-            self.real_ys,
+        self.gt_line, = ax.plot(
+            [],
+            [],
             color="green",
             linewidth=3.0,
             label="Ground truth",
             zorder=4
         )
-        ax.scatter(
-            [odom.gt_x],
-            [odom.gt_y],
+        self.gt_dot = ax.scatter(
+            [],
+            [],
             color="green",
             s=80,
             zorder=4
         )
 
         # Heading arrow
-        arrow_len = 0.8
         arrow_head = 0.15
-        ax.arrow(
-            odom.gt_x,
-            odom.gt_y,
-            arrow_len * math.cos(odom.gt_theta),
-            arrow_len * math.sin(odom.gt_theta),
+        self.arrow = ax.arrow(
+            0.0,
+            0.0,
+            0.0,
+            0.0,
             head_width=arrow_head,
             head_length=arrow_head,
             linewidth=2.5,
@@ -151,4 +134,100 @@ class Visualizer:
         )
 
         ax.legend(loc="upper left")
-        plt.pause(0.001)
+
+        self.dynamic = sorted(
+            [
+                self.range_circle, self.rays, self.hits,
+                self.odom_line, self.odom_dot,
+                self.gt_line, self.gt_dot, self.arrow,
+            ],
+            key=lambda artist: artist.get_zorder()
+        )
+
+        # with blitting, only the dynamic artists are redrawn each frame
+        # on top of a cached render of the static scene
+        self.background = None
+        if self.fig.canvas.supports_blit:
+            for artist in self.dynamic:
+                artist.set_animated(True)
+            self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        """Re-cache the static scene after any full redraw (e.g. resize)."""
+        canvas = self.fig.canvas
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self.dynamic:
+            self.fig.draw_artist(artist)
+
+    def _blit(self):
+        canvas = self.fig.canvas
+        if not canvas.supports_blit:
+            # drawn by the caller's plt.pause()
+            canvas.draw_idle()
+            return
+
+        if self.background is None:
+            canvas.draw()
+        canvas.restore_region(self.background)
+        for artist in self.dynamic:
+            self.fig.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+
+    def update(
+        self,
+        odom,
+        lidar_points,
+        lidar_rays,
+        lidar_hits,
+        obstacles,
+        show_lidar=True,
+        show_odom=True
+    ):
+        # Store trajectory history
+        self.real_xs.append(odom.gt_x)
+        self.real_ys.append(odom.gt_y)
+        self.idea_xs.append(odom.x)
+        self.idea_ys.append(odom.y)
+
+        if self.fig is None or not plt.fignum_exists(self.fig.number):
+            self._build()
+
+        # --------------------------------
+        # LiDAR visualization
+        # --------------------------------
+        for artist in (self.range_circle, self.rays, self.hits):
+            artist.set_visible(show_lidar)
+
+        if show_lidar:
+            self.range_circle.set_center((odom.gt_x, odom.gt_y))
+            self.rays.set_segments(lidar_rays)
+            self.hits.set_offsets(
+                np.asarray(lidar_hits, dtype=float).reshape(-1, 2)
+            )
+
+        # --------------------------------
+        # Odometry estimate (idea)
+        # --------------------------------
+        self.odom_line.set_visible(show_odom)
+        self.odom_dot.set_visible(show_odom)
+
+        if show_odom:
+            self.odom_line.set_data(self.idea_xs, self.idea_ys)
+            self.odom_dot.set_offsets([(odom.x, odom.y)])
+
+        # --------------------------------
+        # Ground truth
+        # --------------------------------
+        self.gt_line.set_data(self.real_xs, self.real_ys)
+        self.gt_dot.set_offsets([(odom.gt_x, odom.gt_y)])
+
+        # Heading arrow
+        arrow_len = 0.8
+        self.arrow.set_data(
+            x=odom.gt_x,
+            y=odom.gt_y,
+            dx=arrow_len * math.cos(odom.gt_theta),
+            dy=arrow_len * math.sin(odom.gt_theta)
+        )
+
+        self._blit()
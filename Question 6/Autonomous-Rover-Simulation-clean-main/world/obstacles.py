@@ -1,3 +1,7 @@
+import math
+import numpy as np
+
+
 class Rectangle:
     def __init__(self, x, y, w, h):
         """
@@ -15,6 +19,46 @@ class Rectangle:
             self.y <= py <= self.y + self.h
         )
 
+    def intersect_ray(self, ox, oy, dx, dy, max_range):
+        """
+        Slab test against a ray starting at (ox, oy)
+        with unit direction (dx, dy).
+
+        Returns the distance to the first boundary hit
+        (0.0 if the origin is inside), or None if the ray
+        misses within max_range.
+        """
+        t_near = 0.0
+        t_far = max_range
+
+        for o, d, lo, hi in (
+            (ox, dx, self.x, self.x + self.w),
+            (oy, dy, self.y, self.y + self.h),
+        ):
+            if d == 0.0:
+                # parallel to this slab: must already be inside it
+                if o < lo or o > hi:
+                    return None
+                continue
+
+            t0 = (lo - o) / d
+            t1 = (hi - o) / d
+            if t0 > t1:
+                t0, t1 = t1, t0
+
+            t_near = max(t_near, t0)
+            t_far = min(t_far, t1)
+            if t_near > t_far:
+                return None
+
+        return t_near
+
+    def distance(self, px, py):
+        """Euclidean distance from (px, py) to the rectangle (0 inside)."""
+        dx = max(self.x - px, 0.0, px - (self.x + self.w))
+        dy = max(self.y - py, 0.0, py - (self.y + self.h))
+        return math.hypot(dx, dy)
+
     def corners(self):
         return [
             (self.x, self.y),
@@ -61,3 +105,14 @@ def get_world_obstacles():
     ])
 
     return obstacles
+
+
+def obstacles_to_array(obstacles):
+    """
+    Pack rectangles into a (K, 4) float array of
+    [x_min, y_min, x_max, y_max] rows for batched queries.
+    """
+    boxes = np.empty((len(obstacles), 4))
+    for i, obs in enumerate(obstacles):
+        boxes[i] = (obs.x, obs.y, obs.x + obs.w, obs.y + obs.h)
+    return boxes
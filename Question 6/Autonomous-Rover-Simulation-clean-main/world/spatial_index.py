@@ -0,0 +1,209 @@
+import math
+
+
+class ObstacleGrid:
+    def __init__(self, obstacles, cell_size=1.0):
+        """
+        Uniform grid over axis-aligned rectangles.
+
+        Every obstacle is registered in each cell its bounding box
+        overlaps, so queries only touch the cells they cover instead
+        of the whole obstacle list. Results are indices into
+        `obstacles`.
+        """
+        self.obstacles = list(obstacles)
+        self.cell = cell_size
+        self.cells = {}
+
+        if self.obstacles:
+            self.x_min = min(o.x for o in self.obstacles)
+            self.y_min = min(o.y for o in self.obstacles)
+            self.x_max = max(o.x + o.w for o in self.obstacles)
+            self.y_max = max(o.y + o.h for o in self.obstacles)
+        else:
+            self.x_min = self.y_min = self.x_max = self.y_max = 0.0
+
+        self.nx = max(1, math.ceil((self.x_max - self.x_min) / self.cell))
+        self.ny = max(1, math.ceil((self.y_max - self.y_min) / self.cell))
+
+        for i, obs in enumerate(self.obstacles):
+            ix0, iy0 = self._cell_of(obs.x, obs.y)
+            ix1, iy1 = self._cell_of(obs.x + obs.w, obs.y + obs.h)
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    self.cells.setdefault((ix, iy), []).append(i)
+
+    # ----------------------------
+    # Helpers
+    # ----------------------------
+    def _cell_of(self, px, py):
+        """Cell containing (px, py), clamped to the grid."""
+        ix = int((px - self.x_min) // self.cell)
+        iy = int((py - self.y_min) // self.cell)
+        return (
+            min(max(ix, 0), self.nx - 1),
+            min(max(iy, 0), self.ny - 1),
+        )
+
+    def _in_bounds(self, px, py):
+        return (
+            self.x_min <= px <= self.x_max and
+            self.y_min <= py <= self.y_max
+        )
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def query_point(self, px, py):
+        """Indices of obstacles containing (px, py)."""
+        if not self._in_bounds(px, py):
+            return []
+        return [
+            i for i in self.cells.get(self._cell_of(px, py), ())
+            if self.obstacles[i].contains(px, py)
+        ]
+
+    def contains(self, px, py):
+        """True if any obstacle contains (px, py)."""
+        if not self._in_bounds(px, py):
+            return False
+        return any(
+            self.obstacles[i].contains(px, py)
+            for i in self.cells.get(self._cell_of(px, py), ())
+        )
+
+    def query_box(self, x_min, y_min, x_max, y_max):
+        """Sorted indices of obstacles overlapping the given box."""
+        if (x_max < self.x_min or x_min > self.x_max or
+                y_max < self.y_min or y_min > self.y_max):
+            return []
+
+        ix0, iy0 = self._cell_of(x_min, y_min)
+        ix1, iy1 = self._cell_of(x_max, y_max)
+
+        found = set()
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                found.update(self.cells.get((ix, iy), ()))
+
+        return sorted(
+            i for i in found
+            if self.obstacles[i].x <= x_max and
+            self.obstacles[i].x + self.obstacles[i].w >= x_min and
+            self.obstacles[i].y <= y_max and
+            self.obstacles[i].y + self.obstacles[i].h >= y_min
+        )
+
+    def clearance(self, px, py, max_dist):
+        """
+        Distance from (px, py) to the nearest obstacle,
+        capped at max_dist.
+        """
+        nearest = max_dist
+        for i in self.query_box(px - max_dist, py - max_dist,
+                                px + max_dist, py + max_dist):
+            nearest = min(nearest, self.obstacles[i].distance(px, py))
+        return nearest
+
+    def _traverse(self, ox, oy, dx, dy, max_range):
+        """
+        Yield (cell, t_cell_exit) for every grid cell crossed by the
+        ray (ox, oy) + t * (dx, dy), 0 <= t <= max_range, in order
+        (Amanatides & Woo grid walk).
+        """
+        # clip the ray to the grid bounds
+        t_enter = 0.0
+        t_exit = max_range
+        for o, d, lo, hi in (
+            (ox, dx, self.x_min, self.x_max),
+            (oy, dy, self.y_min, self.y_max),
+        ):
+            if d == 0.0:
+                if o < lo or o > hi:
+                    return
+                continue
+            t0 = (lo - o) / d
+            t1 = (hi - o) / d
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_enter = max(t_enter, t0)
+            t_exit = min(t_exit, t1)
+            if t_enter > t_exit:
+                return
+
+        ix, iy = self._cell_of(ox + t_enter * dx, oy + t_enter * dy)
+
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        if dx != 0.0:
+            next_x = self.x_min + (ix + (step_x > 0)) * self.cell
+            t_max_x = (next_x - ox) / dx
+            t_delta_x = self.cell / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy != 0.0:
+            next_y = self.y_min + (iy + (step_y > 0)) * self.cell
+            t_max_y = (next_y - oy) / dy
+            t_delta_y = self.cell / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        while 0 <= ix < self.nx and 0 <= iy < self.ny:
+            t_cell_exit = min(t_max_x, t_max_y)
+            yield (ix, iy), t_cell_exit
+            if t_cell_exit > t_exit:
+                return
+
+            if t_max_x < t_max_y:
+                ix += step_x
+                t_max_x += t_delta_x
+            else:
+                iy += step_y
+                t_max_y += t_delta_y
+
+    def raycast(self, ox, oy, dx, dy, max_range):
+        """
+        First obstacle hit by the ray (ox, oy) + t * (dx, dy),
+        with (dx, dy) a unit vector and 0 <= t <= max_range.
+
+        Stops walking the grid as soon as the best hit lies
+        inside the current cell.
+
+        Returns (t, index), or (None, None) on a miss.
+        """
+        best_t = None
+        best_i = None
+        seen = set()
+
+        for cell, t_cell_exit in self._traverse(ox, oy, dx, dy, max_range):
+            for i in self.cells.get(cell, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                t = self.obstacles[i].intersect_ray(ox, oy, dx, dy, max_range)
+                if t is not None and (best_t is None or t < best_t):
+                    best_t = t
+                    best_i = i
+
+            if best_t is not None and best_t <= t_cell_exit:
+                break
+
+        return best_t, best_i
+
+    def query_segment(self, x0, y0, x1, y1):
+        """Sorted indices of obstacles intersecting the segment."""
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length == 0.0:
+            return self.query_point(x0, y0)
+
+        dx = (x1 - x0) / length
+        dy = (y1 - y0) / length
+
+        found = set()
+        for cell, _ in self._traverse(x0, y0, dx, dy, length):
+            found.update(self.cells.get(cell, ()))
+
+        return sorted(
+            i for i in found
+            if self.obstacles[i].intersect_ray(x0, y0, dx, dy, length) is not None
+        )